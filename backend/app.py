@@ -4,63 +4,180 @@ Flask-SocketIO server with latest-wins buffer for stable real-time pose estimati
 Uses MediaPipe for both body and hand tracking with LIVE_STREAM mode
 """
 
-from flask import Flask, request, jsonify, send_from_directory, send_file, Response
+import os
+
+# Pin BLAS/OpenMP pools before numpy/cv2 import: the arrays here are tiny
+# (33x4 landmarks), so intra-op threading only causes oversubscription against
+# MediaPipe's own threadpool. setdefault keeps deployments overridable.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+from flask import Flask, request, send_from_directory, send_file, Response
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import mediapipe as mp
 import cv2
 import numpy as np
-from PIL import Image
+import orjson
 from youtube_downloader import YouTubeDownloader
-import os
-import torch
-import torch.nn as nn
-from collections import deque
-import math
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import logging
+import logging.handlers
+import queue
 import time
 import base64
 import threading
-from io import BytesIO
+
+# Perf logging goes through a queue so slow stdio (journald, docker logs)
+# can never block a pipeline thread; formatting and the actual write happen
+# on the listener's background thread
+_log_queue = queue.SimpleQueue()
+perf_logger = logging.getLogger("livedance.perf")
+perf_logger.setLevel(logging.INFO)
+perf_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+perf_logger.propagate = False
+logging.handlers.QueueListener(_log_queue, logging.StreamHandler()).start()
+
+class OrjsonSerializer:
+    """
+    json-module stand-in that lets python-socketio encode packets with orjson.
+    Halves serialization time on the pose_result payload shape (many small
+    dicts with repeated keys) versus stdlib json.
+    """
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
 
 app = Flask(__name__)
+# Behind nginx/Apache, let the proxy send video files zero-copy via
+# sendfile(2): Flask then emits an X-Sendfile header instead of streaming
+# bytes through Python. Off by default (the dev server has no proxy).
+app.config["USE_X_SENDFILE"] = os.environ.get("LIVEDANCE_USE_X_SENDFILE", "0") == "1"
 CORS(app, resources={r"/*": {"origins": "*"}})
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading', ping_timeout=60, ping_interval=25)
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading', ping_timeout=60, ping_interval=25, json=OrjsonSerializer)
 
 # Initialize YouTube downloader
 youtube_downloader = YouTubeDownloader(output_dir="downloads")
 
+def json_response(payload, status=200):
+    """
+    Serialize a response with orjson instead of Flask's stdlib-json jsonify.
+    orjson is 3-10x faster on landmark payloads and handles NumPy scalars/arrays
+    natively, so callers can pass array slices without .tolist() casts.
+    """
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json",
+    )
+
+def read_frame_bytes():
+    """
+    Read the uploaded frame from the request body.
+    Clients may POST the JPEG directly (Content-Type: image/*), which skips
+    werkzeug's multipart parsing entirely; multipart 'frame' uploads from
+    existing clients are still accepted. Returns None when no frame was sent.
+    """
+    if request.mimetype and request.mimetype.startswith("image/"):
+        return request.get_data()
+    if "frame" in request.files:
+        return request.files["frame"].read()
+    return None
+
+# =============================================================================
+# Duplicate-frame gate for HTTP endpoints
+# =============================================================================
+class DuplicateFrameCache:
+    """
+    Remembers the hash of the last uploaded frame and its computed payload.
+    Clients often re-submit identical frames (paused video, static camera)
+    faster than MediaPipe can process them; a cheap byte hash gates the whole
+    compute-bound pipeline in that case.
+    """
+    def __init__(self):
+        self.last_hash = None
+        self.last_payload = None
+        self.lock = threading.Lock()
+
+    def lookup(self, frame_bytes):
+        """Return the cached payload if the frame is byte-identical, else None"""
+        digest = zlib.crc32(frame_bytes)
+        with self.lock:
+            if digest == self.last_hash and self.last_payload is not None:
+                return self.last_payload
+        return None
+
+    def store(self, frame_bytes, payload):
+        """Cache the payload computed for this frame"""
+        digest = zlib.crc32(frame_bytes)
+        with self.lock:
+            self.last_hash = digest
+            self.last_payload = payload
+
+# One cache per HTTP endpoint (camera and reference streams are independent)
+camera_frame_cache = DuplicateFrameCache()
+reference_frame_cache = DuplicateFrameCache()
+
 # =============================================================================
 # LATEST-WINS BUFFER - Core of the optimization
 # =============================================================================
 class LatestFrameBuffer:
     """
-    Single-slot buffer that only keeps the newest frame.
-    Older frames are discarded by design to prevent queue buildup.
+    Latest-wins buffer that only keeps the newest item.
+    Older items are discarded by design to prevent queue buildup.
+    Used for every stage handoff in the pipeline.
+
+    Double-buffered ping-pong scheme for one producer and one consumer:
+    the producer writes into its private slot outside the lock, then
+    publishes with an index swap. The lock only ever covers a couple of
+    pointer/int operations, so neither thread can stall the other.
     """
     def __init__(self):
-        self.frame_data = None
+        self._slots = [None, None]
+        self._write_idx = 0  # producer-private, never touched by get()
+        self._ready_idx = None  # index of the published slot, or None
+        self._ready_event = threading.Event()
         self.lock = threading.Lock()
         self.dropped_count = 0
 
-    def put(self, frame_bytes, timestamp, sequence, use3D=True):
-        """Store new frame, discarding any previous frame"""
+    def put(self, frame_data):
+        """Store new item, discarding any previous unconsumed one"""
+        idx = self._write_idx
+        self._slots[idx] = frame_data
         with self.lock:
-            if self.frame_data is not None:
+            if self._ready_idx is not None:
                 self.dropped_count += 1
-            self.frame_data = {
-                'bytes': frame_bytes,
-                'timestamp': timestamp,
-                'sequence': sequence,
-                'use3D': use3D
-            }
+                self._slots[self._ready_idx] = None
+            self._ready_idx = idx
+            # Set under the lock so publish/set and take/clear stay ordered;
+            # set after release could race get() clearing the event and leave
+            # it stuck set with an empty buffer (wait() then never blocks)
+            self._ready_event.set()
+        self._write_idx = 1 - idx
 
     def get(self):
-        """Get and clear the latest frame"""
+        """Get and clear the latest item"""
         with self.lock:
-            data = self.frame_data
-            self.frame_data = None
+            idx = self._ready_idx
+            if idx is None:
+                return None
+            self._ready_idx = None
+            data = self._slots[idx]
+            self._slots[idx] = None
+            self._ready_event.clear()
             return data
 
+    def wait(self, timeout):
+        """Block until an item is (probably) available, or the timeout"""
+        self._ready_event.wait(timeout)
+
     def get_stats(self):
         """Get dropped frame count"""
         with self.lock:
@@ -68,8 +185,12 @@ class LatestFrameBuffer:
             self.dropped_count = 0
             return count
 
-# Global buffer instance
+# Stage handoffs: raw frames from the WebSocket, decoded frames for inference,
+# inference results for smoothing+emit. Each is latest-wins so a slow stage
+# never causes queue buildup behind it.
 frame_buffer = LatestFrameBuffer()
+decoded_buffer = LatestFrameBuffer()
+result_buffer = LatestFrameBuffer()
 
 # =============================================================================
 # MediaPipe Setup for LIVE_STREAM mode
@@ -80,8 +201,8 @@ mp_hands = mp.solutions.hands
 # Initialize detectors for WebSocket (LIVE_STREAM mode)
 pose = mp_pose.Pose(
     static_image_mode=False,  # LIVE_STREAM mode
-    model_complexity=1,
-    smooth_landmarks=True,
+    model_complexity=0,  # Lite model: ~half the FLOPs, enough for live tracking
+    smooth_landmarks=False,  # PoseSmoothing does EMA; MediaPipe's filter on top is duplicated work
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5,
 )
@@ -89,20 +210,23 @@ pose = mp_pose.Pose(
 hands = mp_hands.Hands(
     static_image_mode=False,  # LIVE_STREAM mode
     max_num_hands=2,
-    model_complexity=1,
+    model_complexity=0,  # Lite model: ~half the FLOPs, enough for live tracking
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5,
 )
 
-# Create SEPARATE pose and hands detectors for HTTP endpoints (camera/reference)
-pose_camera = mp_pose.Pose(
+# Shared static-image detectors for the HTTP endpoints. Static mode keeps no
+# cross-frame tracker state, so the camera and reference endpoints can share a
+# single pair behind locks - this halves MediaPipe graph memory versus the
+# previous per-endpoint instances.
+pose_static = mp_pose.Pose(
     static_image_mode=True,
     model_complexity=1,
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5,
 )
 
-hands_camera = mp_hands.Hands(
+hands_static = mp_hands.Hands(
     static_image_mode=True,
     max_num_hands=2,
     model_complexity=1,
@@ -110,35 +234,38 @@ hands_camera = mp_hands.Hands(
     min_tracking_confidence=0.5,
 )
 
-pose_reference = mp_pose.Pose(
-    static_image_mode=True,
-    model_complexity=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5,
-)
+pose_static_lock = threading.Lock()
+hands_static_lock = threading.Lock()
 
-hands_reference = mp_hands.Hands(
-    static_image_mode=True,
-    max_num_hands=2,
-    model_complexity=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5,
-)
+def static_pose_process(image_rgb):
+    """Run the shared static pose detector (serialized across HTTP requests)"""
+    with pose_static_lock:
+        return pose_static.process(image_rgb)
+
+def static_hands_process(image_rgb):
+    """Run the shared static hands detector (serialized across HTTP requests)"""
+    with hands_static_lock:
+        return hands_static.process(image_rgb)
+
+# Thread pool for running pose and hand inference concurrently. MediaPipe
+# releases the GIL inside its C++ graph, so the two detectors overlap on
+# separate cores (each detector object is still only used by one task at a time)
+detector_pool = ThreadPoolExecutor(max_workers=2)
 
 # Monotonic timestamp generator
 class TimestampGenerator:
+    """
+    Strictly monotonic timestamps without a lock: itertools.count.__next__ is
+    a single C-level increment that is atomic under the GIL, so concurrent
+    callers never block or see duplicates.
+    """
     def __init__(self):
-        self.last_timestamp = 0
-        self.lock = threading.Lock()
-    
+        # Seed with the current monotonic clock in microseconds
+        self._counter = itertools.count(int(time.monotonic() * 1000000))
+
     def get_next(self):
         """Generate strictly monotonic increasing timestamps"""
-        with self.lock:
-            current = int(time.monotonic() * 1000000)  # microseconds
-            if current <= self.last_timestamp:
-                current = self.last_timestamp + 1
-            self.last_timestamp = current
-            return current
+        return next(self._counter)
 
 timestamp_gen = TimestampGenerator()
 
@@ -157,7 +284,7 @@ BODY_KEYPOINT_NAMES = [
     "left_foot_index", "right_foot_index",
 ]
 
-MOVENET_INDICES = [0, 2, 5, 7, 8, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28]
+MOVENET_INDICES = np.array([0, 2, 5, 7, 8, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28], np.int32)
 MOVENET_NAMES = [
     "nose", "left_eye", "right_eye", "left_ear", "right_ear",
     "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
@@ -180,87 +307,148 @@ HAND_LANDMARK_SELECTION = [
     ("pinky_tip", 20),
 ]
 HAND_LANDMARK_NAMES = [name for name, _ in HAND_LANDMARK_SELECTION]
+HAND_LANDMARK_IDX = np.array([idx for _, idx in HAND_LANDMARK_SELECTION], np.int32)
+
+# =============================================================================
+# Landmark extraction helpers
+# =============================================================================
+def landmarks_to_ndarray(landmark_list):
+    """
+    Bulk-extract a MediaPipe landmark list into one (N, 4) float32 array of
+    (x, y, z, visibility). Touches each pybind11 attribute exactly once so
+    downstream consumers can slice instead of re-reading protobuf fields.
+    """
+    return np.fromiter(
+        (v for lm in landmark_list for v in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float32, count=len(landmark_list) * 4
+    ).reshape(-1, 4)
+
+def extract_body_landmarks(pose_landmarks, width, height):
+    """Vectorized conversion of MediaPipe pose landmarks to the 17-keypoint payload"""
+    sel = landmarks_to_ndarray(pose_landmarks.landmark)[MOVENET_INDICES]
+
+    xy = np.round(sel[:, :2] * (width, height), 1)
+    conf = np.round(sel[:, 3] * 100).astype(int)
+    visible = sel[:, 3] > 0.3
+
+    return [
+        {"name": name, "x": x, "y": y, "confidence": c, "visible": v}
+        for name, (x, y), c, v in zip(
+            MOVENET_NAMES, xy.tolist(), conf.tolist(), visible.tolist()
+        )
+    ]
+
+def extract_hand_landmarks(hand_results, width, height):
+    """Vectorized conversion of MediaPipe hand results to the reduced left/right payload"""
+    hand_landmarks = {"left": [], "right": []}
+
+    if hand_results.multi_hand_landmarks and hand_results.multi_handedness:
+        for hand_lms, handedness in zip(
+            hand_results.multi_hand_landmarks, hand_results.multi_handedness
+        ):
+            hand_side = handedness.classification[0].label.lower()
+            if hand_side not in hand_landmarks:
+                continue
+
+            sel = landmarks_to_ndarray(hand_lms.landmark)[HAND_LANDMARK_IDX]
+
+            xy = np.round(sel[:, :2] * (width, height), 1)
+            z = np.round(sel[:, 2], 3)
+            normalized = np.round(sel[:, :2], 3)
+
+            hand_landmarks[hand_side] = [
+                {
+                    "name": name, "x": x, "y": y, "z": zv,
+                    "normalized_x": nx, "normalized_y": ny,
+                }
+                for name, (x, y), zv, (nx, ny) in zip(
+                    HAND_LANDMARK_NAMES, xy.tolist(), z.tolist(), normalized.tolist()
+                )
+            ]
+
+    return hand_landmarks
 
 # =============================================================================
 # 3D Pose Estimation - MediaPipe World Landmarks
 # =============================================================================
-def calculate_angle_3d(p1, p2, p3):
-    """Calculate angle between three 3D points (in degrees)"""
-    v1 = np.array([p1.x - p2.x, p1.y - p2.y, p1.z - p2.z])
-    v2 = np.array([p3.x - p2.x, p3.y - p2.y, p3.z - p2.z])
-    
-    norm_v1 = np.linalg.norm(v1)
-    norm_v2 = np.linalg.norm(v2)
-    
-    if norm_v1 < 1e-6 or norm_v2 < 1e-6:
-        return 0.0
-    
-    v1_normalized = v1 / norm_v1
-    v2_normalized = v2 / norm_v2
-    
-    cos_angle = np.clip(np.dot(v1_normalized, v2_normalized), -1.0, 1.0)
-    angle_rad = np.arccos(cos_angle)
-    angle_deg = np.degrees(angle_rad)
-    
-    return round(angle_deg, 1)
 
-def calculate_3d_angles_mediapipe(world_landmarks):
-    """Calculate joint angles from MediaPipe 3D world landmarks"""
+# Joint-angle triples (first point, vertex, second point) as index arrays so
+# all 8 angles can be computed in a single vectorized NumPy pass
+ANGLE_NAMES = [
+    'left_elbow', 'right_elbow', 'left_knee', 'right_knee',
+    'left_shoulder', 'right_shoulder', 'left_hip', 'right_hip',
+]
+ANGLE_P1_IDX = np.array([11, 12, 23, 24, 13, 14, 11, 12])
+ANGLE_P2_IDX = np.array([13, 14, 25, 26, 11, 12, 23, 24])  # vertex of each angle
+ANGLE_P3_IDX = np.array([15, 16, 27, 28, 23, 24, 25, 26])
+
+# Key joints exposed as 3D coordinates, as parallel name/index tables
+KEY_JOINT_NAMES = (
+    'left_shoulder', 'right_shoulder',
+    'left_elbow', 'right_elbow',
+    'left_wrist', 'right_wrist',
+    'left_hip', 'right_hip',
+    'left_knee', 'right_knee',
+    'left_ankle', 'right_ankle',
+)
+KEY_JOINT_IDX = np.array([11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28], np.int32)
+
+def _angles_from_points(pts, p1_idx, p2_idx, p3_idx):
+    """Batch angle kernel: degrees for each (p1, vertex, p3) triple, 0.0 when degenerate"""
+    v1 = pts[p1_idx] - pts[p2_idx]
+    v2 = pts[p3_idx] - pts[p2_idx]
+    norms = np.sqrt(np.sum(v1 * v1, axis=1) * np.sum(v2 * v2, axis=1))
+    cos_angles = np.where(
+        norms > 1e-6,
+        np.sum(v1 * v2, axis=1) / np.maximum(norms, 1e-12),
+        1.0,  # cos 0deg -> degenerate triples report a 0.0 angle
+    )
+    return np.degrees(np.arccos(np.clip(cos_angles, -1.0, 1.0)))
+
+def _ema_inplace(buf, new, alpha):
+    """EMA fuse kernel: buf = alpha*new + (1-alpha)*buf, element-wise in place"""
+    flat_buf = buf.ravel()
+    flat_new = new.ravel()
+    for i in range(flat_buf.size):
+        flat_buf[i] = alpha * flat_new[i] + (1.0 - alpha) * flat_buf[i]
+
+# Numba is optional: when available, compile the kernels once and skip NumPy
+# dispatch overhead on every frame; the plain vectorized paths are the fallback
+try:
+    from numba import njit
+    _angles_from_points = njit(cache=True)(_angles_from_points)
+    _ema_inplace = njit(cache=True, fastmath=True)(_ema_inplace)
+except ImportError:
+    def _ema_inplace(buf, new, alpha):
+        # In-place AXPY fallback: no temporaries beyond alpha*new
+        buf *= 1.0 - alpha
+        buf += alpha * new
+
+def world_landmarks_to_ndarray(world_landmarks):
+    """Convert a MediaPipe world-landmark list to an (N, 3) float32 xyz array"""
+    return np.fromiter(
+        (c for lm in world_landmarks for c in (lm.x, lm.y, lm.z)),
+        dtype=np.float32, count=len(world_landmarks) * 3
+    ).reshape(-1, 3)
+
+def calculate_3d_angles_mediapipe(pts):
+    """Calculate joint angles from an (N, 3) array of 3D world landmarks"""
     angles = {}
     coords = {}
-    
-    if len(world_landmarks) >= 33:
-        # Left elbow
-        angles['left_elbow'] = calculate_angle_3d(
-            world_landmarks[11], world_landmarks[13], world_landmarks[15]
-        )
-        # Right elbow
-        angles['right_elbow'] = calculate_angle_3d(
-            world_landmarks[12], world_landmarks[14], world_landmarks[16]
-        )
-        # Left knee
-        angles['left_knee'] = calculate_angle_3d(
-            world_landmarks[23], world_landmarks[25], world_landmarks[27]
-        )
-        # Right knee
-        angles['right_knee'] = calculate_angle_3d(
-            world_landmarks[24], world_landmarks[26], world_landmarks[28]
-        )
-        # Left shoulder
-        angles['left_shoulder'] = calculate_angle_3d(
-            world_landmarks[13], world_landmarks[11], world_landmarks[23]
-        )
-        # Right shoulder
-        angles['right_shoulder'] = calculate_angle_3d(
-            world_landmarks[14], world_landmarks[12], world_landmarks[24]
-        )
-        # Left hip
-        angles['left_hip'] = calculate_angle_3d(
-            world_landmarks[11], world_landmarks[23], world_landmarks[25]
-        )
-        # Right hip
-        angles['right_hip'] = calculate_angle_3d(
-            world_landmarks[12], world_landmarks[24], world_landmarks[26]
-        )
-        
-        # Extract 3D coordinates for key joints
-        key_joints = {
-            'left_shoulder': 11, 'right_shoulder': 12,
-            'left_elbow': 13, 'right_elbow': 14,
-            'left_wrist': 15, 'right_wrist': 16,
-            'left_hip': 23, 'right_hip': 24,
-            'left_knee': 25, 'right_knee': 26,
-            'left_ankle': 27, 'right_ankle': 28,
+
+    if len(pts) >= 33:
+        # All 8 angles in one vectorized pass instead of 8 separate
+        # np.dot/np.linalg.norm calls
+        degrees = _angles_from_points(pts, ANGLE_P1_IDX, ANGLE_P2_IDX, ANGLE_P3_IDX)
+        angles = dict(zip(ANGLE_NAMES, degrees.round(1).tolist()))
+
+        # Extract 3D coordinates for key joints in one gather + round
+        key_xyz = np.round(pts[KEY_JOINT_IDX], 3).tolist()
+        coords = {
+            name: {'x': x, 'y': y, 'z': z}
+            for name, (x, y, z) in zip(KEY_JOINT_NAMES, key_xyz)
         }
-        
-        for joint_name, idx in key_joints.items():
-            lm = world_landmarks[idx]
-            coords[joint_name] = {
-                'x': round(lm.x, 3),
-                'y': round(lm.y, 3),
-                'z': round(lm.z, 3)
-            }
-    
+
     return angles, coords
 
 # =============================================================================
@@ -271,38 +459,52 @@ class PoseSmoothing:
     def __init__(self, alpha=0.7):
         self.alpha = alpha  # Higher = more weight to new values
         self.smoothed_body = None
+        self.body_vis_mask = None
         self.smoothed_hands = {'left': None, 'right': None}
         self.smoothed_3d_angles = None
         self.smoothed_3d_coords = None
     
     def smooth_body(self, landmarks):
-        """Smooth body landmarks"""
+        """Smooth body landmarks (EMA over a persistent (N,2) float32 buffer)"""
         if not landmarks:
             return landmarks
-        
-        if self.smoothed_body is None:
-            self.smoothed_body = landmarks
-            return landmarks
-        
-        smoothed = []
-        for i, lm in enumerate(landmarks):
-            if i < len(self.smoothed_body):
-                prev = self.smoothed_body[i]
-                smoothed.append({
-                    'name': lm['name'],
-                    'x': self.alpha * lm['x'] + (1 - self.alpha) * prev['x'],
-                    'y': self.alpha * lm['y'] + (1 - self.alpha) * prev['y'],
-                    'confidence': lm['confidence'],
-                    'visible': lm['visible']
-                })
-            else:
-                smoothed.append(lm)
-        
-        self.smoothed_body = smoothed
-        return smoothed
+
+        new_xy = np.array([[lm['x'], lm['y']] for lm in landmarks], dtype=np.float32)
+        vis_mask = np.fromiter(
+            (lm['visible'] for lm in landmarks), dtype=bool, count=len(landmarks)
+        )
+
+        if self.smoothed_body is None or len(self.smoothed_body) != len(new_xy):
+            self.smoothed_body = new_xy
+        elif vis_mask.all() and self.body_vis_mask.all():
+            _ema_inplace(self.smoothed_body, new_xy, self.alpha)
+        else:
+            # Only blend keypoints visible in both frames; ones that just
+            # (re)appeared snap to the new position (alpha=1) instead of
+            # getting dragged toward a stale prior for several frames
+            alpha_vec = np.where(
+                vis_mask & self.body_vis_mask, self.alpha, 1.0
+            ).astype(np.float32)[:, None]
+            self.smoothed_body *= 1.0 - alpha_vec
+            self.smoothed_body += alpha_vec * new_xy
+
+        self.body_vis_mask = vis_mask
+
+        # Round at emit: full-precision float32 repr (e.g. 512.3000030517578)
+        # roughly doubles the serialized payload vs 0.1px granularity
+        return [
+            {
+                'name': lm['name'],
+                'x': x,
+                'y': y,
+                'confidence': lm['confidence'],
+                'visible': lm['visible'],
+            }
+            for lm, (x, y) in zip(landmarks, np.round(self.smoothed_body, 1).tolist())
+        ]
     
     def smooth_hands(self, hands_data):
-        """Smooth hand landmarks"""
+        """Smooth hand landmarks (EMA over persistent per-side (N,2) buffers)"""
         smoothed_hands = {'left': [], 'right': []}
         
         for side in ['left', 'right']:
@@ -311,72 +513,61 @@ class PoseSmoothing:
                 self.smoothed_hands[side] = None
                 continue
             
-            if self.smoothed_hands[side] is None:
-                self.smoothed_hands[side] = landmarks
-                smoothed_hands[side] = landmarks
-                continue
-            
-            smoothed = []
-            for i, lm in enumerate(landmarks):
-                if i < len(self.smoothed_hands[side]):
-                    prev = self.smoothed_hands[side][i]
-                    smoothed.append({
-                        'name': lm['name'],
-                        'x': self.alpha * lm['x'] + (1 - self.alpha) * prev['x'],
-                        'y': self.alpha * lm['y'] + (1 - self.alpha) * prev['y'],
-                        'z': lm.get('z', 0),
-                        'normalized_x': lm.get('normalized_x', 0),
-                        'normalized_y': lm.get('normalized_y', 0)
-                    })
-                else:
-                    smoothed.append(lm)
+            new_xy = np.array([[lm['x'], lm['y']] for lm in landmarks], dtype=np.float32)
+            state = self.smoothed_hands[side]
+            if state is None or len(state) != len(new_xy):
+                self.smoothed_hands[side] = new_xy
+            else:
+                _ema_inplace(state, new_xy, self.alpha)
             
-            self.smoothed_hands[side] = smoothed
-            smoothed_hands[side] = smoothed
+            smoothed_hands[side] = [
+                {
+                    'name': lm['name'],
+                    'x': x,
+                    'y': y,
+                    'z': lm.get('z', 0),
+                    'normalized_x': lm.get('normalized_x', 0),
+                    'normalized_y': lm.get('normalized_y', 0)
+                }
+                for lm, (x, y) in zip(
+                    landmarks, np.round(self.smoothed_hands[side], 1).tolist()
+                )
+            ]
         
         return smoothed_hands
     
     def smooth_3d_angles(self, angles):
-        """Smooth 3D angles"""
+        """Smooth 3D angles (EMA over a persistent (8,) float32 buffer)"""
         if not angles:
             return angles
         
-        if self.smoothed_3d_angles is None:
-            self.smoothed_3d_angles = angles
-            return angles
-        
-        smoothed = {}
-        for key, value in angles.items():
-            if key in self.smoothed_3d_angles:
-                smoothed[key] = self.alpha * value + (1 - self.alpha) * self.smoothed_3d_angles[key]
-            else:
-                smoothed[key] = value
+        new_vals = np.fromiter(angles.values(), dtype=np.float32, count=len(angles))
+        if self.smoothed_3d_angles is None or len(self.smoothed_3d_angles) != len(new_vals):
+            self.smoothed_3d_angles = new_vals
+        else:
+            _ema_inplace(self.smoothed_3d_angles, new_vals, self.alpha)
         
-        self.smoothed_3d_angles = smoothed
-        return smoothed
+        return dict(zip(angles, np.round(self.smoothed_3d_angles, 1).tolist()))
     
     def smooth_3d_coords(self, coords):
-        """Smooth 3D coordinates"""
+        """Smooth 3D coordinates (EMA over a persistent (N,3) float32 buffer)"""
         if not coords:
             return coords
         
-        if self.smoothed_3d_coords is None:
-            self.smoothed_3d_coords = coords
-            return coords
-        
-        smoothed = {}
-        for joint, coord in coords.items():
-            if joint in self.smoothed_3d_coords:
-                smoothed[joint] = {
-                    'x': self.alpha * coord['x'] + (1 - self.alpha) * self.smoothed_3d_coords[joint]['x'],
-                    'y': self.alpha * coord['y'] + (1 - self.alpha) * self.smoothed_3d_coords[joint]['y'],
-                    'z': self.alpha * coord['z'] + (1 - self.alpha) * self.smoothed_3d_coords[joint]['z']
-                }
-            else:
-                smoothed[joint] = coord
+        new_xyz = np.array(
+            [[c['x'], c['y'], c['z']] for c in coords.values()], dtype=np.float32
+        )
+        if self.smoothed_3d_coords is None or len(self.smoothed_3d_coords) != len(new_xyz):
+            self.smoothed_3d_coords = new_xyz
+        else:
+            _ema_inplace(self.smoothed_3d_coords, new_xyz, self.alpha)
         
-        self.smoothed_3d_coords = smoothed
-        return smoothed
+        return {
+            joint: {'x': x, 'y': y, 'z': z}
+            for joint, (x, y, z) in zip(
+                coords, np.round(self.smoothed_3d_coords, 3).tolist()
+            )
+        }
 
 # Global smoothing instance
 smoother = PoseSmoothing(alpha=0.7)
@@ -384,185 +575,440 @@ smoother = PoseSmoothing(alpha=0.7)
 # =============================================================================
 # Frame downscaling for performance
 # =============================================================================
-def downscale_frame(image, target_short_side=384):
-    """Downscale image to target short side while maintaining aspect ratio"""
+# Short-side target for inference input, overridable per deployment
+POSE_INPUT_SHORT_SIDE = int(os.environ.get("LIVEDANCE_INPUT_SHORT_SIDE", "384"))
+
+# Resize plans keyed by (input_h, input_w, target): the output size and
+# interpolation choice only depend on the input resolution, which is stable
+# per stream, so compute them once instead of per frame
+_downscale_plans = {}
+
+def _downscale_plan(height, width, target_short_side):
+    """Return (new_width, new_height, interpolation), or None for a no-op"""
+    short_side = min(height, width)
+    if short_side <= target_short_side:
+        return None
+    scale = target_short_side / short_side
+    # INTER_AREA's box filter is worth it on big shrinks (no aliasing
+    # shimmer); for mild ones INTER_LINEAR is cheaper and equivalent
+    interp = cv2.INTER_AREA if scale <= 0.5 else cv2.INTER_LINEAR
+    return int(width * scale), int(height * scale), interp
+
+def downscale_frame(image, target_short_side=POSE_INPUT_SHORT_SIDE, scratch=None):
+    """
+    Downscale image to target short side while maintaining aspect ratio.
+
+    scratch is an optional caller-owned dict; the resize output buffer is
+    cached there keyed by shape, so a steady stream of same-sized frames
+    reuses one allocation instead of churning ~100 MB/s through the allocator.
+    Only safe when the caller consumes the result before the next call.
+    """
     height, width = image.shape[:2]
     
-    if height < width:
-        if height <= target_short_side:
-            return image
-        scale = target_short_side / height
-    else:
-        if width <= target_short_side:
-            return image
-        scale = target_short_side / width
-    
-    new_width = int(width * scale)
-    new_height = int(height * scale)
+    key = (height, width, target_short_side)
+    plan = _downscale_plans.get(key)
+    if plan is None and key not in _downscale_plans:
+        plan = _downscale_plans[key] = _downscale_plan(height, width, target_short_side)
+    if plan is None:
+        return image
+    new_width, new_height, interp = plan
     
-    return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    dst = None
+    if scratch is not None:
+        dst = scratch.get((new_height, new_width))
+        if dst is None:
+            dst = scratch[(new_height, new_width)] = np.empty(
+                (new_height, new_width, 3), np.uint8
+            )
+    return cv2.resize(image, (new_width, new_height), dst=dst, interpolation=interp)
+
+# PyTurboJPEG is optional: it wraps libjpeg-turbo's SIMD (AVX2/NEON) Huffman
+# and IDCT paths, roughly 2x faster than OpenCV's bundled decoder on camera
+# frames. OpenCV remains the fallback and handles non-JPEG formats.
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+def decode_image(image_bytes, half_scale=False):
+    """
+    Decode compressed frame bytes to a BGR array, optionally at 1/2 scale
+    (performed in the DCT domain by libjpeg, so it is nearly free).
+    Returns None for undecodable input.
+    """
+    if _turbo_jpeg is not None:
+        try:
+            if half_scale:
+                return _turbo_jpeg.decode(
+                    image_bytes, pixel_format=TJPF_BGR, scaling_factor=(1, 2)
+                )
+            return _turbo_jpeg.decode(image_bytes, pixel_format=TJPF_BGR)
+        except (OSError, IOError, ValueError):
+            pass  # non-JPEG frame (e.g. PNG): fall through to OpenCV
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    return cv2.imdecode(
+        nparr, cv2.IMREAD_REDUCED_COLOR_2 if half_scale else cv2.IMREAD_COLOR
+    )
 
 # =============================================================================
-# Inference Thread - Consumes frames from latest-wins buffer
+# Pipeline Threads - decode / infer / smooth+emit over latest-wins handoffs
 # =============================================================================
 inference_running = False
-inference_thread = None
+pipeline_threads = []
 processed_frame_count = 0
 
-def inference_loop():
-    """Main inference loop that processes frames from the buffer"""
-    global processed_frame_count
-
-    print("🔄 Inference thread started")
+# Previous-frame wrist visibility gates hand detection: when the dancer's
+# wrists were not visible a frame ago, hands will not be findable either, so
+# skip the whole hands graph. Indices into MOVENET_NAMES.
+LEFT_WRIST_MN, RIGHT_WRIST_MN = 9, 10
+wrists_visible = True
+# While gated off, still probe for hands every Nth frame so a wrong or stale
+# gate self-corrects within a fraction of a second
+HAND_RECHECK_INTERVAL = 5
+
+# Mean-abs-diff (on a 1/32 subsample, 0-255 scale) below which a frame is
+# considered unchanged and the previous landmarks are re-served instead of
+# re-running the detectors. Webcam sensor noise sits well under 1.0.
+QUIESCENT_DIFF_THRESHOLD = float(os.environ.get("LIVEDANCE_QUIESCENT_DIFF", "1.0"))
+
+def _pin_inference_thread():
+    """
+    Best-effort: give the inference thread a dedicated core and higher
+    priority so the OS does not migrate it or co-schedule it with the
+    Flask/Socket.IO threads. Both knobs are Linux-only tuning and fail
+    quietly on macOS or when unprivileged.
+    """
+    try:
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) >= 4:
+            # pid 0 == calling thread for the affinity syscall
+            os.sched_setaffinity(0, {cores[-1]})
+    except (AttributeError, OSError):
+        pass
+    try:
+        os.nice(-5)
+    except (AttributeError, OSError):
+        pass
+
+def decode_loop():
+    """Stage 1: decode, downscale and color-convert frames from the buffer"""
+    print("🔄 Decode thread started")
+
+    # Full-resolution short side seen on the previous frame. When it is at
+    # least twice the inference input size, let libjpeg decode at 1/2 scale
+    # (DCT-domain downscaling): decode + half the resize in a single pass
+    # over ~4x fewer pixels. Camera resolution is stable, so last frame's
+    # size is a safe predictor.
+    last_short_side = 0
+
+    # Thread-local resize scratch: the downscaled BGR intermediate is consumed
+    # by cvtColor below before the next frame overwrites it. The RGB output is
+    # NOT reused - it is handed to the inference stage, which may still be
+    # reading it while this thread decodes the next frame.
+    resize_scratch = {}
+
+    # Hot-loop local bindings (LOAD_FAST instead of global + attribute lookup)
+    _perf = time.perf_counter
+    _get = frame_buffer.get
+    _wait = frame_buffer.wait
+    _put = decoded_buffer.put
 
     while inference_running:
-        # Get the latest frame from buffer
-        frame_data = frame_buffer.get()
+        frame_data = _get()
 
         if frame_data is None:
-            time.sleep(0.001)  # 1ms sleep if no frame available
+            _wait(0.1)  # woken immediately by put(); timeout re-checks shutdown
             continue
 
         try:
-            # Timing instrumentation
             timings = {}
-            process_start = time.perf_counter()
-
-            # Decode image
-            decode_start = time.perf_counter()
-            image_bytes = base64.b64decode(frame_data['bytes'])
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            timings['image_decode'] = (time.perf_counter() - decode_start) * 1000
+            process_start = _perf()
+
+            # Decode image - binary Socket.IO payloads arrive as raw JPEG bytes,
+            # legacy clients still send base64 strings
+            decode_start = _perf()
+            image_bytes = frame_data['bytes']
+            if isinstance(image_bytes, str):
+                image_bytes = base64.b64decode(image_bytes)
+            use_reduced = last_short_side >= 2 * POSE_INPUT_SHORT_SIDE
+            image = decode_image(image_bytes, half_scale=use_reduced)
+            timings['image_decode'] = (_perf() - decode_start) * 1000
 
             if image is None:
                 continue
 
             # Store original dimensions BEFORE downscaling (FIX for skeleton offset)
             original_height, original_width = image.shape[:2]
+            if use_reduced:
+                original_height *= 2
+                original_width *= 2
+            last_short_side = min(original_width, original_height)
 
             # Downscale for performance
-            downscale_start = time.perf_counter()
-            image = downscale_frame(image, target_short_side=384)
-            timings['downscale'] = (time.perf_counter() - downscale_start) * 1000
+            downscale_start = _perf()
+            image = downscale_frame(image, scratch=resize_scratch)
+            timings['downscale'] = (_perf() - downscale_start) * 1000
 
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            height, width = image.shape[:2]  # Downscaled dimensions
 
-            # Process pose
-            pose_start = time.perf_counter()
-            pose_results = pose.process(image_rgb)
-            timings['pose_detection'] = (time.perf_counter() - pose_start) * 1000
+            _put({
+                'image_rgb': image_rgb,
+                'original_width': original_width,
+                'original_height': original_height,
+                'sequence': frame_data['sequence'],
+                'use3D': frame_data.get('use3D', True),
+                'timings': timings,
+                'process_start': process_start,
+            })
+
+        except Exception as e:
+            print(f"❌ Error in decode loop: {e}")
+            import traceback
+            traceback.print_exc()
+            continue
+
+    print("🛑 Decode thread stopped")
+
+def inference_loop():
+    """Stage 2: MediaPipe pose + hands inference and landmark extraction"""
+    global wrists_visible
+
+    _pin_inference_thread()
+    print("🔄 Inference thread started")
 
-            # Process hands
-            hands_start = time.perf_counter()
-            hand_results = hands.process(image_rgb)
-            timings['hand_detection'] = (time.perf_counter() - hands_start) * 1000
+    # Hot-loop local bindings (LOAD_FAST instead of global + attribute lookup)
+    _perf = time.perf_counter
+    _get = decoded_buffer.get
+    _wait = decoded_buffer.wait
+    _put = result_buffer.put
+
+    frame_idx = 0
+    prev_small = None
+    last_result = None
+
+    while inference_running:
+        frame = _get()
+
+        if frame is None:
+            _wait(0.1)  # woken immediately by put(); timeout re-checks shutdown
+            continue
+
+        try:
+            timings = frame['timings']
+            image_rgb = frame['image_rgb']
+            original_width = frame['original_width']
+            original_height = frame['original_height']
+            use3D = frame['use3D']
+            frame_idx += 1
+
+            # Content gate: a coarse subsample diff is nearly free and spots
+            # paused reference video or a motionless scene, where re-running
+            # the detectors would reproduce the previous landmarks anyway
+            small = image_rgb[::32, ::32].astype(np.int16)
+            if (
+                last_result is not None
+                and last_result['use3D'] == use3D
+                and prev_small is not None
+                and small.shape == prev_small.shape
+                and np.abs(small - prev_small).mean() < QUIESCENT_DIFF_THRESHOLD
+            ):
+                prev_small = small
+                timings['pose_detection'] = 0.0
+                timings['hand_detection'] = 0.0
+                result = dict(last_result)
+                result['sequence'] = frame['sequence']
+                result['process_start'] = frame['process_start']
+                result['timings'] = timings
+                _put(result)
+                continue
+            prev_small = small
+
+            # Process pose and hands concurrently on the shared pool.
+            # Hands are skipped while the previous frame had no visible
+            # wrist, with a periodic recheck so the gate cannot stick off.
+            run_hands = wrists_visible or frame_idx % HAND_RECHECK_INTERVAL == 0
+            detect_start = _perf()
+            hands_future = detector_pool.submit(hands.process, image_rgb) if run_hands else None
+            pose_results = pose.process(image_rgb)
+            timings['pose_detection'] = (_perf() - detect_start) * 1000
+            hand_results = hands_future.result() if hands_future is not None else None
+            timings['hand_detection'] = (_perf() - detect_start) * 1000 - timings['pose_detection']
 
             # Extract body landmarks
+            # (use ORIGINAL dimensions so the skeleton is not offset)
             body_landmarks = []
-            keypoints_2d = []
             pose_3d_angles = {}
             pose_3d_coords = {}
 
             if pose_results.pose_landmarks:
-                landmarks = pose_results.pose_landmarks.landmark
-
-                for idx, name in zip(MOVENET_INDICES, MOVENET_NAMES):
-                    if idx < len(landmarks):
-                        lm = landmarks[idx]
-                        body_landmarks.append({
-                            "name": name,
-                            "x": round(lm.x * original_width, 1),  # Use ORIGINAL dimensions
-                            "y": round(lm.y * original_height, 1),  # Use ORIGINAL dimensions
-                            "confidence": round(lm.visibility * 100),
-                            "visible": lm.visibility > 0.3,
-                        })
-                        keypoints_2d.append([lm.x, lm.y])
+                body_landmarks = extract_body_landmarks(
+                    pose_results.pose_landmarks, original_width, original_height
+                )
+
+                # Update the hand-detection gate for the next frame
+                wrists_visible = (
+                    body_landmarks[LEFT_WRIST_MN]['visible']
+                    or body_landmarks[RIGHT_WRIST_MN]['visible']
+                )
 
                 # 3D pose estimation using MediaPipe world landmarks (only if use3D is True)
-                use3D = frame_data.get('use3D', True)
-                angles_start = time.perf_counter()
+                angles_start = _perf()
                 if use3D and pose_results.pose_world_landmarks:
-                    world_landmarks = pose_results.pose_world_landmarks.landmark
-                    pose_3d_angles, pose_3d_coords = calculate_3d_angles_mediapipe(world_landmarks)
-                timings['3d_calculation'] = (time.perf_counter() - angles_start) * 1000
+                    # Convert protobuf landmarks to an ndarray once, here;
+                    # the angle/coord math below is array-only
+                    world_pts = world_landmarks_to_ndarray(
+                        pose_results.pose_world_landmarks.landmark
+                    )
+                    pose_3d_angles, pose_3d_coords = calculate_3d_angles_mediapipe(world_pts)
+                timings['3d_calculation'] = (_perf() - angles_start) * 1000
+
+            else:
+                # No pose this frame: re-enable hands rather than risk a
+                # stuck-off gate (e.g. close-ups where only hands are in frame)
+                wrists_visible = True
 
             # Extract hand landmarks
-            hand_landmarks = {"left": [], "right": []}
-
-            if hand_results.multi_hand_landmarks and hand_results.multi_handedness:
-                for hand_idx, hand_lms in enumerate(hand_results.multi_hand_landmarks):
-                    handedness = hand_results.multi_handedness[hand_idx].classification[0].label
-                    hand_side = handedness.lower()
-
-                    if hand_side not in hand_landmarks:
-                        continue
-
-                    hand_data = []
-                    for landmark_name, mp_index in HAND_LANDMARK_SELECTION:
-                        if mp_index >= len(hand_lms.landmark):
-                            continue
-                        lm = hand_lms.landmark[mp_index]
-                        hand_data.append({
-                            "name": landmark_name,
-                            "x": round(lm.x * original_width, 1),  # Use ORIGINAL dimensions
-                            "y": round(lm.y * original_height, 1),  # Use ORIGINAL dimensions
-                            "z": round(lm.z, 3),
-                            "normalized_x": round(lm.x, 3),
-                            "normalized_y": round(lm.y, 3),
-                        })
-                    
-                    hand_landmarks[hand_side] = hand_data
-            
+            if hand_results is not None:
+                hand_landmarks = extract_hand_landmarks(
+                    hand_results, original_width, original_height
+                )
+            else:
+                hand_landmarks = {"left": [], "right": []}
+
+            result = {
+                'body': body_landmarks,
+                'hands': hand_landmarks,
+                'pose_3d_angles': pose_3d_angles,
+                'pose_3d_coords': pose_3d_coords,
+                'sequence': frame['sequence'],
+                'use3D': use3D,
+                'timings': timings,
+                'process_start': frame['process_start'],
+            }
+            last_result = result
+            _put(result)
+
+        except Exception as e:
+            print(f"❌ Error in inference loop: {e}")
+            import traceback
+            traceback.print_exc()
+            continue
+
+    print("🛑 Inference thread stopped")
+
+# Outbound rate cap: at most this many pose_result emits per second. The
+# result handoff is latest-wins, so capping just means fresher (not queued)
+# results reach slow clients. 0 disables the cap.
+EMIT_HZ = float(os.environ.get("LIVEDANCE_EMIT_HZ", "60"))
+
+def emit_loop():
+    """Stage 3: EMA smoothing, performance logging and WebSocket emit"""
+    global processed_frame_count
+
+    print("🔄 Emit thread started")
+
+    # Hot-loop local bindings (LOAD_FAST instead of global + attribute lookup)
+    _perf = time.perf_counter
+    _sleep = time.sleep
+    _get = result_buffer.get
+    _wait = result_buffer.wait
+    _emit = socketio.emit
+    _smooth_body = smoother.smooth_body
+    _smooth_hands = smoother.smooth_hands
+    _smooth_3d_angles = smoother.smooth_3d_angles
+    _smooth_3d_coords = smoother.smooth_3d_coords
+
+    min_emit_interval = 1.0 / EMIT_HZ if EMIT_HZ > 0 else 0.0
+    last_emit = 0.0
+
+    while inference_running:
+        result = _get()
+
+        if result is None:
+            _wait(0.1)  # woken immediately by put(); timeout re-checks shutdown
+            continue
+
+        # Pace emits to the cap, then take any result that arrived while
+        # waiting so the client always gets the freshest one
+        wait = last_emit + min_emit_interval - _perf()
+        if wait > 0:
+            _sleep(wait)
+            newer = _get()
+            if newer is not None:
+                result = newer
+
+        try:
+            timings = result['timings']
+            use3D = result['use3D']
+
             # Apply EMA smoothing
-            smooth_start = time.perf_counter()
-            body_landmarks = smoother.smooth_body(body_landmarks)
-            hand_landmarks = smoother.smooth_hands(hand_landmarks)
+            smooth_start = _perf()
+            body_landmarks = _smooth_body(result['body'])
+            hand_landmarks = _smooth_hands(result['hands'])
             if use3D:
-                pose_3d_angles = smoother.smooth_3d_angles(pose_3d_angles)
-                pose_3d_coords = smoother.smooth_3d_coords(pose_3d_coords)
-            timings['smoothing'] = (time.perf_counter() - smooth_start) * 1000
-            
-            # Total backend time
-            total_backend_time = (time.perf_counter() - process_start) * 1000
+                pose_3d_angles = _smooth_3d_angles(result['pose_3d_angles'])
+                pose_3d_coords = _smooth_3d_coords(result['pose_3d_coords'])
+            else:
+                # Drop stale 3D smoothing state so re-entering 3D mode snaps
+                # to fresh values instead of blending with old ones
+                smoother.smoothed_3d_angles = None
+                smoother.smoothed_3d_coords = None
+            timings['smoothing'] = (_perf() - smooth_start) * 1000
+
+            # Total backend time (from decode start, across all stages)
+            total_backend_time = (_perf() - result['process_start']) * 1000
             timings['total_backend'] = total_backend_time
-            
+
             processed_frame_count += 1
-            
-            # Get dropped frame stats
-            dropped = frame_buffer.get_stats()
-            
-            # Log performance every 30 frames
+
+            # Get dropped frame stats across all stage handoffs
+            dropped = (
+                frame_buffer.get_stats()
+                + decoded_buffer.get_stats()
+                + result_buffer.get_stats()
+            )
+
+            # Log performance every 30 frames (lazy %-formatting: the string
+            # is only built on the log listener thread)
             if processed_frame_count % 30 == 0:
-                print(f"⚡ Backend [Frame {processed_frame_count}]: "
-                      f"Decode: {timings['image_decode']:.1f}ms | "
-                      f"Downscale: {timings['downscale']:.1f}ms | "
-                      f"Pose: {timings['pose_detection']:.1f}ms | "
-                      f"3D: {timings.get('3d_calculation', 0):.1f}ms | "
-                      f"Hands: {timings['hand_detection']:.1f}ms | "
-                      f"Smooth: {timings['smoothing']:.1f}ms | "
-                      f"TOTAL: {total_backend_time:.1f}ms | "
-                      f"Dropped: {dropped}")
-            
-            # Emit result back to client via WebSocket
-            socketio.emit('pose_result', {
+                perf_logger.info(
+                    "⚡ Backend [Frame %d]: Decode: %.1fms | Downscale: %.1fms | "
+                    "Pose: %.1fms | 3D: %.1fms | Hands: %.1fms | Smooth: %.1fms | "
+                    "TOTAL: %.1fms | Dropped: %d",
+                    processed_frame_count,
+                    timings['image_decode'],
+                    timings['downscale'],
+                    timings['pose_detection'],
+                    timings.get('3d_calculation', 0),
+                    timings['hand_detection'],
+                    timings['smoothing'],
+                    total_backend_time,
+                    dropped,
+                )
+
+            # Emit result back to client via WebSocket. The 3D keys are
+            # omitted entirely in 2D mode (the client checks for presence)
+            payload = {
                 'body': body_landmarks,
                 'hands': hand_landmarks,
-                'pose_3d_angles': pose_3d_angles if use3D else {},
-                'pose_3d_coords': pose_3d_coords if use3D else {},
                 'timings': timings,
-                'sequence': frame_data['sequence'],
+                'sequence': result['sequence'],
                 'mode': '3D' if use3D else '2D'
-            })
-            
+            }
+            if use3D:
+                payload['pose_3d_angles'] = pose_3d_angles
+                payload['pose_3d_coords'] = pose_3d_coords
+            _emit('pose_result', payload)
+            last_emit = _perf()
+
         except Exception as e:
-            print(f"❌ Error in inference loop: {e}")
+            print(f"❌ Error in emit loop: {e}")
             import traceback
             traceback.print_exc()
             continue
-    
-    print("🛑 Inference thread stopped")
+
+    print("🛑 Emit thread stopped")
 
 # =============================================================================
 # WebSocket Event Handlers
@@ -570,35 +1016,74 @@ def inference_loop():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
-    global inference_running, inference_thread
+    global inference_running, pipeline_threads, last_ingest_seq
     
     print("🔌 Client connected via WebSocket")
+
+    # A (re)connecting client restarts its sequence numbers
+    last_ingest_seq = -1
     
-    # Start inference thread if not running
+    # Start pipeline threads if not running
     if not inference_running:
         inference_running = True
-        inference_thread = threading.Thread(target=inference_loop, daemon=True)
-        inference_thread.start()
+        pipeline_threads = [
+            threading.Thread(target=decode_loop, daemon=True),
+            threading.Thread(target=inference_loop, daemon=True),
+            threading.Thread(target=emit_loop, daemon=True),
+        ]
+        for t in pipeline_threads:
+            t.start()
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     print("🔌 Client disconnected")
 
+# Receive-side gate: out-of-order frames are dropped before the payload is
+# even copied, and an optional ingest cap (LIVEDANCE_INGEST_MAX_FPS, 0 =
+# uncapped) sheds excess client frames ahead of the buffer
+INGEST_MAX_FPS = float(os.environ.get("LIVEDANCE_INGEST_MAX_FPS", "0"))
+MIN_INGEST_INTERVAL = 1.0 / INGEST_MAX_FPS if INGEST_MAX_FPS > 0 else 0.0
+last_ingest_seq = -1
+last_ingest_time = 0.0
+
 @socketio.on('frame')
 def handle_frame(data):
     """
     Receive frame from client and put in latest-wins buffer.
     Old frames are automatically discarded.
+    The 'image' field may be raw JPEG bytes (binary Socket.IO payload,
+    preferred: ~25% less wire traffic and no base64 decode) or a base64 string
+    from legacy clients.
     """
+    global last_ingest_seq, last_ingest_time
     try:
+        sequence = data.get('sequence', 0)
+
+        # Drop frames that arrived out of order (an older frame would only
+        # be decoded and then overwritten) and apply the ingest cap, both
+        # before the payload bytes are touched
+        if sequence and sequence <= last_ingest_seq:
+            return
+        now = time.perf_counter()
+        if MIN_INGEST_INTERVAL and now - last_ingest_time < MIN_INGEST_INTERVAL:
+            return
+        last_ingest_seq = sequence
+        last_ingest_time = now
+
         frame_bytes = data.get('image')
+        if isinstance(frame_bytes, bytearray):
+            frame_bytes = bytes(frame_bytes)
         timestamp = data.get('timestamp', time.time())
-        sequence = data.get('sequence', 0)
         use3D = data.get('use3D', True)  # Get mode from client
         
         # Put frame in buffer (overwrites any existing frame)
-        frame_buffer.put(frame_bytes, timestamp, sequence, use3D)
+        frame_buffer.put({
+            'bytes': frame_bytes,
+            'timestamp': timestamp,
+            'sequence': sequence,
+            'use3D': use3D,
+        })
         
     except Exception as e:
         print(f"❌ Error receiving frame: {e}")
@@ -624,69 +1109,93 @@ def estimate_pose():
     Returns: JSON with body and hands landmark data
     """
     try:
-        # Get image from request
-        if "frame" not in request.files:
-            return jsonify({"error": "No frame provided"}), 400
+        # Get image from request (raw body or multipart)
+        frame_bytes = read_frame_bytes()
+        if not frame_bytes:
+            return json_response({"error": "No frame provided"}, status=400)
 
-        file = request.files["frame"]
+        # Byte-identical frame to the previous request: return the cached result
+        cached = camera_frame_cache.lookup(frame_bytes)
+        if cached is not None:
+            return json_response(cached)
 
-        # Convert to OpenCV image
-        image = Image.open(BytesIO(file.read()))
-        image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        # Decode via TurboJPEG when available, OpenCV otherwise; single
+        # decode, one BGR2RGB conversion further down, no PIL round-trip
+        image = decode_image(frame_bytes)
 
-        # Get image dimensions
+        if image is None:
+            return json_response({"error": "Invalid image data"}, status=400)
+
+        # Get ORIGINAL dimensions (landmark coords are scaled back to these)
         height, width = image.shape[:2]
 
-        # Convert to RGB for MediaPipe
+        # Downscale before inference; MediaPipe resizes internally anyway,
+        # so feeding it 1080p only adds memory-bound preprocessing cost
+        image = downscale_frame(image)
+
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image_rgb.flags.writeable = False  # MediaPipe fast path (no copy)
 
-        # Process body pose using CAMERA-SPECIFIC instance
-        pose_results = pose_camera.process(image_rgb)
+        # Run body and hand detection concurrently on the shared static detectors
+        hands_future = detector_pool.submit(static_hands_process, image_rgb)
+        pose_results = static_pose_process(image_rgb)
         body_landmarks = []
-
         if pose_results.pose_landmarks:
-            landmarks = pose_results.pose_landmarks.landmark
-
-            # Extract only the 17 keypoints matching MoveNet format
-            for idx, name in zip(MOVENET_INDICES, MOVENET_NAMES):
-                if idx < len(landmarks):
-                    lm = landmarks[idx]
-                    body_landmarks.append({
-                        "name": name,
-                        "x": round(lm.x * width, 1),
-                        "y": round(lm.y * height, 1),
-                        "confidence": round(lm.visibility * 100),
-                        "visible": lm.visibility > 0.3,
-                    })
-
-        # Process hands using CAMERA-SPECIFIC instance
-        hand_results = hands_camera.process(image_rgb)
-        hand_landmarks = {"left": [], "right": []}
-
-        if hand_results.multi_hand_landmarks and hand_results.multi_handedness:
-            for hand_idx, hand_lms in enumerate(hand_results.multi_hand_landmarks):
-                handedness = hand_results.multi_handedness[hand_idx].classification[0].label
-                hand_side = handedness.lower()
-
-                hand_data = []
-                for lm_idx, lm in enumerate(hand_lms.landmark):
-                    hand_data.append({
-                        "name": HAND_LANDMARK_NAMES[lm_idx],
-                        "x": round(lm.x * width, 1),
-                        "y": round(lm.y * height, 1),
-                        "z": round(lm.z, 3),
-                        "normalized_x": round(lm.x, 3),
-                        "normalized_y": round(lm.y, 3),
-                    })
-
-                hand_landmarks[hand_side] = hand_data
-
-        # Return results
-        return jsonify({"body": body_landmarks, "hands": hand_landmarks})
+            body_landmarks = extract_body_landmarks(
+                pose_results.pose_landmarks, width, height
+            )
+
+        # Collect hand results started above
+        hand_results = hands_future.result()
+        hand_landmarks = extract_hand_landmarks(hand_results, width, height)
+
+        # Cache and return results
+        payload = {"body": body_landmarks, "hands": hand_landmarks}
+        camera_frame_cache.store(frame_bytes, payload)
+        return json_response(payload)
 
     except Exception as e:
         print(f"Error processing camera frame: {e}")
-        return jsonify({"body": [], "hands": {"left": [], "right": []}}), 200
+        return json_response({"body": [], "hands": {"left": [], "right": []}})
+
+
+def process_reference_frame(frame_bytes):
+    """
+    Run the reference-frame pipeline (decode, downscale, static pose + hands)
+    on raw image bytes. Returns the landmark payload, or None when the bytes
+    are not a decodable image.
+    """
+    # Decode via TurboJPEG when available, OpenCV otherwise (single decode,
+    # no PIL round-trip)
+    image = decode_image(frame_bytes)
+
+    if image is None:
+        return None
+
+    # Get ORIGINAL dimensions (landmark coords are scaled back to these)
+    height, width = image.shape[:2]
+
+    # Downscale before inference; MediaPipe resizes internally anyway,
+    # so feeding it 1080p only adds memory-bound preprocessing cost
+    image = downscale_frame(image)
+
+    # Convert to RGB for MediaPipe
+    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    # Run body and hand detection concurrently on the shared static detectors
+    hands_future = detector_pool.submit(static_hands_process, image_rgb)
+    pose_results = static_pose_process(image_rgb)
+    body_landmarks = []
+    if pose_results.pose_landmarks:
+        body_landmarks = extract_body_landmarks(
+            pose_results.pose_landmarks, width, height
+        )
+
+    # Collect hand results started above
+    hand_results = hands_future.result()
+    hand_landmarks = extract_hand_landmarks(hand_results, width, height)
+
+    return {"body": body_landmarks, "hands": hand_landmarks}
 
 
 @app.route("/estimate_pose_reference", methods=["POST"])
@@ -698,69 +1207,49 @@ def estimate_pose_reference():
     Returns: JSON with body and hands landmark data
     """
     try:
-        # Get image from request
-        if "frame" not in request.files:
-            return jsonify({"error": "No frame provided"}), 400
+        # Get image from request (raw body or multipart)
+        frame_bytes = read_frame_bytes()
+        if not frame_bytes:
+            return json_response({"error": "No frame provided"}, status=400)
 
-        file = request.files["frame"]
+        # Byte-identical frame to the previous request: return the cached result
+        cached = reference_frame_cache.lookup(frame_bytes)
+        if cached is not None:
+            return json_response(cached)
 
-        # Convert to OpenCV image
-        image = Image.open(BytesIO(file.read()))
-        image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        payload = process_reference_frame(frame_bytes)
+        if payload is None:
+            return json_response({"error": "Invalid image data"}, status=400)
 
-        # Get image dimensions
-        height, width = image.shape[:2]
+        # Cache and return results
+        reference_frame_cache.store(frame_bytes, payload)
+        return json_response(payload)
 
-        # Convert to RGB for MediaPipe
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    except Exception as e:
+        print(f"Error processing reference frame: {e}")
+        return json_response({"body": [], "hands": {"left": [], "right": []}})
 
-        # Process body pose using REFERENCE-SPECIFIC instance
-        pose_results = pose_reference.process(image_rgb)
-        body_landmarks = []
 
-        if pose_results.pose_landmarks:
-            landmarks = pose_results.pose_landmarks.landmark
-
-            # Extract only the 17 keypoints matching MoveNet format
-            for idx, name in zip(MOVENET_INDICES, MOVENET_NAMES):
-                if idx < len(landmarks):
-                    lm = landmarks[idx]
-                    body_landmarks.append({
-                        "name": name,
-                        "x": round(lm.x * width, 1),
-                        "y": round(lm.y * height, 1),
-                        "confidence": round(lm.visibility * 100),
-                        "visible": lm.visibility > 0.3,
-                    })
-
-        # Process hands using REFERENCE-SPECIFIC instance
-        hand_results = hands_reference.process(image_rgb)
-        hand_landmarks = {"left": [], "right": []}
-
-        if hand_results.multi_hand_landmarks and hand_results.multi_handedness:
-            for hand_idx, hand_lms in enumerate(hand_results.multi_hand_landmarks):
-                handedness = hand_results.multi_handedness[hand_idx].classification[0].label
-                hand_side = handedness.lower()
-
-                hand_data = []
-                for lm_idx, lm in enumerate(hand_lms.landmark):
-                    hand_data.append({
-                        "name": HAND_LANDMARK_NAMES[lm_idx],
-                        "x": round(lm.x * width, 1),
-                        "y": round(lm.y * height, 1),
-                        "z": round(lm.z, 3),
-                        "normalized_x": round(lm.x, 3),
-                        "normalized_y": round(lm.y, 3),
-                    })
-
-                hand_landmarks[hand_side] = hand_data
-
-        # Return results
-        return jsonify({"body": body_landmarks, "hands": hand_landmarks})
+@app.route("/estimate_pose_reference_batch", methods=["POST"])
+def estimate_pose_reference_batch():
+    """
+    Process a batch of reference frames in one request.
+    Expects: multipart/form-data with repeated 'frames' image files, in order
+    Returns: JSON with a result entry per frame (null for undecodable frames)
+    One round-trip replaces N estimate_pose_reference calls, so the client
+    can pre-analyze a whole reference clip without per-frame HTTP overhead.
+    """
+    try:
+        frames = request.files.getlist("frames")
+        if not frames:
+            return json_response({"error": "No frames provided"}, status=400)
+
+        results = [process_reference_frame(f.read()) for f in frames]
+        return json_response({"results": results})
 
     except Exception as e:
-        print(f"Error processing reference frame: {e}")
-        return jsonify({"body": [], "hands": {"left": [], "right": []}}), 200
+        print(f"Error processing reference batch: {e}")
+        return json_response({"error": str(e)}, status=500)
 
 
 @app.route("/download_video", methods=["POST"])
@@ -774,7 +1263,7 @@ def download_video():
         data = request.get_json()
 
         if not data or "url" not in data:
-            return jsonify({"error": "No URL provided"}), 400
+            return json_response({"error": "No URL provided"}, status=400)
 
         url = data["url"]
         filename = data.get("filename")
@@ -792,24 +1281,24 @@ def download_video():
         )
 
         if result["success"]:
-            return jsonify({
+            return json_response({
                 "success": True,
                 "filepath": result["filepath"],
                 "title": result["title"],
                 "duration": result["duration"],
                 "message": "Video downloaded successfully"
-            }), 200
+            })
         else:
-            return jsonify({
+            return json_response({
                 "success": False,
                 "error": result["error"]
-            }), 500
+            }, status=500)
 
     except Exception as e:
-        return jsonify({
+        return json_response({
             "success": False,
             "error": str(e)
-        }), 500
+        }, status=500)
 
 
 @app.route("/video_info", methods=["POST"])
@@ -823,143 +1312,123 @@ def get_video_info():
         data = request.get_json()
 
         if not data or "url" not in data:
-            return jsonify({"error": "No URL provided"}), 400
+            return json_response({"error": "No URL provided"}, status=400)
 
         url = data["url"]
         info = youtube_downloader.get_video_info(url)
 
         if info["success"]:
-            return jsonify(info), 200
+            return json_response(info)
         else:
-            return jsonify({
+            return json_response({
                 "success": False,
                 "error": info["error"]
-            }), 500
+            }, status=500)
 
     except Exception as e:
-        return jsonify({
+        return json_response({
             "success": False,
             "error": str(e)
-        }), 500
+        }, status=500)
+
 
+# list_downloads scan cache, invalidated by the directory mtime (bumped by
+# every completed download or deletion)
+_downloads_cache = {'mtime': 0.0, 'files': []}
 
 @app.route("/list_downloads", methods=["GET"])
 def list_downloads():
     """
     List all downloaded videos
     Returns: JSON with list of video files
+    The scan result is cached against the directory's mtime, so repeated
+    polls cost one stat() instead of O(N) syscalls plus per-file stats.
     """
     try:
         downloads_dir = youtube_downloader.output_dir
-        print(f"\n[DEBUG] list_downloads called")
-        print(f"[DEBUG] Downloads directory: {downloads_dir}")
-        print(f"[DEBUG] Directory exists: {downloads_dir.exists()}")
 
         if not downloads_dir.exists():
-            print(f"[DEBUG] Downloads directory does not exist, returning empty list")
-            return jsonify({"files": []}), 200
+            return json_response({"files": []})
+
+        dir_mtime = downloads_dir.stat().st_mtime
+        if dir_mtime == _downloads_cache['mtime']:
+            return json_response({"files": _downloads_cache['files']})
 
         files = []
-        print(f"[DEBUG] Scanning directory for video files...")
         for file in downloads_dir.iterdir():
-            print(f"[DEBUG] Found file: {file.name} (is_file: {file.is_file()}, suffix: {file.suffix})")
             if file.is_file() and file.suffix in [".mp4", ".m4a"]:
-                file_info = {
+                files.append({
                     "filename": file.name,
                     "size": file.stat().st_size,
                     "path": str(file),
-                }
-                files.append(file_info)
-                print(f"[DEBUG] Added to list: {file_info}")
+                })
 
-        print(f"[DEBUG] Total files found: {len(files)}")
-        print(f"[DEBUG] Returning: {files}")
-        return jsonify({"files": files}), 200
+        _downloads_cache['mtime'] = dir_mtime
+        _downloads_cache['files'] = files
+        return json_response({"files": files})
 
     except Exception as e:
         print(f"[ERROR] list_downloads failed: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({
+        return json_response({
             "success": False,
             "error": str(e)
-        }), 500
+        }, status=500)
 
 
 @app.route("/video/<path:filename>", methods=["GET"])
 def serve_video(filename):
     """
     Serve a video file from the downloads directory
-    Supports range requests for video seeking
+    Range requests for seeking are handled by Flask's conditional send path,
+    which streams through wsgi.file_wrapper (sendfile) instead of reading the
+    requested chunk into Python bytes
     """
     try:
         downloads_dir = youtube_downloader.output_dir
-        video_path = downloads_dir / filename
-
-        print(f"\n[DEBUG] serve_video called")
-        print(f"[DEBUG] Requested filename: {filename}")
-        print(f"[DEBUG] Full path: {video_path}")
-        print(f"[DEBUG] File exists: {video_path.exists()}")
-
-        if not video_path.exists():
-            return jsonify({"success": False, "error": "Video not found"}), 404
-
-        # Get file size
-        file_size = video_path.stat().st_size
-
-        # Check for range request
-        range_header = request.headers.get('Range')
-
-        if range_header:
-            # Parse range header
-            byte_range = range_header.replace('bytes=', '').split('-')
-            start = int(byte_range[0]) if byte_range[0] else 0
-            end = int(byte_range[1]) if len(byte_range) > 1 and byte_range[1] else file_size - 1
-
-            # Read the requested chunk
-            with open(video_path, 'rb') as f:
-                f.seek(start)
-                chunk_size = end - start + 1
-                data = f.read(chunk_size)
-
-            # Create response with proper headers for range request
-            response = Response(
-                data,
-                206,  # Partial Content
-                mimetype='video/mp4',
-                direct_passthrough=True
-            )
-            response.headers.add('Content-Range', f'bytes {start}-{end}/{file_size}')
-            response.headers.add('Accept-Ranges', 'bytes')
-            response.headers.add('Content-Length', str(chunk_size))
 
-            print(f"[DEBUG] Serving range: {start}-{end}/{file_size}")
-            return response
-        else:
-            # Serve entire file
-            print(f"[DEBUG] Serving entire file ({file_size} bytes)")
-            response = send_from_directory(
-                downloads_dir,
-                filename,
-                as_attachment=False,
-                mimetype='video/mp4'
-            )
-            response.headers.add('Accept-Ranges', 'bytes')
-            return response
+        if not (downloads_dir / filename).exists():
+            return json_response({"success": False, "error": "Video not found"}, status=404)
+
+        response = send_from_directory(
+            downloads_dir,
+            filename,
+            as_attachment=False,
+            mimetype='video/mp4',
+            conditional=True,  # honors Range/If-Modified-Since headers
+        )
+        response.headers.add('Accept-Ranges', 'bytes')
+        return response
 
     except Exception as e:
         print(f"[ERROR] serve_video failed: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({
+        return json_response({
             "success": False,
             "error": str(e)
-        }), 404
+        }, status=404)
 
 
 # =============================================================================
 # Server Startup
 # =============================================================================
+def warm_up_detectors():
+    """
+    Run one synthetic frame through every MediaPipe graph at boot.
+    The first process() call triggers lazy TFLite delegate init and buffer
+    allocation (100-300ms), which would otherwise stall the first real frame
+    a connecting client sends.
+    """
+    dummy = np.zeros((POSE_INPUT_SHORT_SIDE, POSE_INPUT_SHORT_SIDE, 3), dtype=np.uint8)
+    warm_start = time.perf_counter()
+    pose.process(dummy)
+    hands.process(dummy)
+    static_pose_process(dummy)
+    static_hands_process(dummy)
+    print(f"🔥 MediaPipe warm-up done in {(time.perf_counter() - warm_start) * 1000:.0f}ms")
+
 if __name__ == "__main__":
     print("🚀 LiveDance Python Backend Starting...")
     print("📡 Server running at http://localhost:8000")
@@ -971,4 +1440,5 @@ if __name__ == "__main__":
     print("   - Frame downscaling for performance")
     print("   - YouTube video download & serving")
     print("   - HTTP fallback endpoints")
+    warm_up_detectors()
     socketio.run(app, host="0.0.0.0", port=8000, debug=False, allow_unsafe_werkzeug=True)
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the LiveDance backend
+
+Run from the backend directory with:
+    gunicorn -c gunicorn.conf.py app:app
+
+Flask-SocketIO (threading async mode) requires a single worker so every
+Socket.IO client talks to the same latest-wins buffer and inference thread;
+concurrency comes from the thread pool instead of forked workers.
+
+Note: under gthread workers Socket.IO cannot upgrade connections to
+WebSocket, so clients are served over long-polling only. That also means
+every poll cycle counts as an HTTP request, which is why this config must
+never enable max_requests: recycling the single stateful worker would drop
+every live session and all in-memory tracking state mid-stream.
+"""
+
+bind = "0.0.0.0:8000"
+
+# Socket.IO state (frame buffer, inference thread, MediaPipe graphs) lives in
+# process memory, so scale with threads rather than workers
+workers = 1
+threads = 16
+worker_class = "gthread"
+
+# MediaPipe inference on large frames can take a while; keep connections alive
+timeout = 60
@@ -3,10 +3,140 @@ YouTube Video Downloader Module
 Downloads YouTube videos for pose estimation analysis
 """
 
+import atexit
+import hashlib
+import json
 import os
-import yt_dlp
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 from pathlib import Path
 
+# yt_dlp is imported lazily (it loads every extractor module, ~hundreds of
+# ms) so that constructing a YouTubeDownloader, cache hits, and CLI --help
+# never pay for it
+
+# Lifetime of the on-disk metadata cache. Titles/durations/thumbnails rarely
+# change, so a day of staleness is a fair trade for skipping the extractor's
+# HTTPS round-trips on repeat lookups
+META_CACHE_TTL = 86400
+
+# Lifetime of the in-memory full-info cache shared between get_video_info and
+# download_video. Kept short because the extracted format URLs carry signed,
+# expiring tokens — stale ones would 403 mid-download
+INFO_CACHE_TTL = 300
+
+# Parallel fragment fetches for HLS/DASH formats (YouTube serves high-quality
+# video fragmented). Serial fragments leave a fast link idle for an RTT per
+# fragment; a few in flight keep it saturated
+FRAG_JOBS = int(os.environ.get("LIVEDANCE_FRAG_JOBS", "4"))
+
+# Opt-in multi-connection fetching via aria2c, for CDNs that throttle each
+# TCP connection: every file/fragment is split into parallel ranged GETs.
+# Off by default because the external downloader reports much coarser
+# progress through our hooks
+USE_ARIA2C = os.environ.get("LIVEDANCE_ARIA2C", "").lower() in ("1", "true", "yes")
+
+# Cap on idle YoutubeDL instances kept warm in the pool. Option signatures
+# vary per call (custom output filenames, per-batch progress hooks), so
+# without a bound a long-lived server would strand one instance — with its
+# open connection pool — per distinct signature it ever saw
+YDL_POOL_MAX = 8
+
+
+# YouTube URL shapes carry an 11-character video ID we can sanity-check
+# without the network; URLs for other platforms go straight to the extractor
+_YT_ID = re.compile(r"(?:v=|youtu\.be/|/shorts/|/live/|/embed/)([A-Za-z0-9_-]{11})")
+
+
+def _noop_progress_hook(d):
+    """Silent stand-in for the per-chunk progress hook in batch mode"""
+
+
+def _status_key(filename):
+    """
+    Collapse per-stream temp names down to one status-line key per video
+
+    yt-dlp downloads DASH video and audio as separate files
+    (title.f137.mp4, title.f140.m4a) before merging; stripping the format
+    suffix and extension maps all of them — and the final file — onto the
+    same line in the batch status block.
+    """
+    base = os.path.basename(filename)
+    return re.sub(r"(\.f\d+)?\.\w+$", "", base)
+
+
+class _QueueProgress:
+    """
+    Progress hook that forwards throttled status lines to a queue
+
+    One shared instance serves every batch worker (so the YoutubeDL pool
+    sees a stable hook object); updates are keyed by video and throttled
+    per key, and the printing itself happens on the single consumer thread.
+    """
+
+    def __init__(self, put):
+        self.put = put
+        self._last = {}
+
+    def __call__(self, d):
+        if d.get("status") != "downloading":
+            return
+        key = _status_key(d.get("filename") or "?")
+        now = time.monotonic()
+        if now - self._last.get(key, 0.0) < 0.25:
+            return
+        self._last[key] = now
+        pct = d.get("_percent_str", "").strip()
+        spd = d.get("_speed_str", "")
+        eta = d.get("_eta_str", "")
+        self.put((key, f"{pct}  {spd}  ETA {eta}  {key}"))
+
+
+def _batch_status_printer(q):
+    """
+    Single consumer that redraws one status line per in-flight download
+
+    N workers printing interleaved carriage-return lines to one terminal is
+    unreadable, and every print is a write syscall under the interpreter's
+    stdout lock. Routing updates through a queue to this thread coalesces
+    them: each wakeup drains everything queued and repaints the status
+    block once (ANSI cursor-up + clear-line). Exits on a None sentinel.
+    """
+    lines = {}
+    drawn = 0
+    running = True
+    while running:
+        item = q.get()
+        if item is None:
+            break
+        updates = [item]
+        try:
+            while True:
+                nxt = q.get_nowait()
+                if nxt is None:
+                    running = False
+                    break
+                updates.append(nxt)
+        except queue.Empty:
+            pass
+        for key, text in updates:
+            lines[key] = text
+        if drawn:
+            print(f"\x1b[{drawn}A", end="")
+        for text in lines.values():
+            print(f"\x1b[2K{text}")
+        drawn = len(lines)
+
 
 class YouTubeDownloader:
     """Handles downloading YouTube videos for dance analysis"""
@@ -20,10 +150,41 @@ class YouTubeDownloader:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        # output_dir never changes after init, so the outtmpl strings can be
+        # rendered once instead of rebuilt from Path pieces on every call
+        self._out_dir_s = os.fspath(self.output_dir)
+        self._tmpl_prefix = self._out_dir_s + os.sep
+        self._tmpl_auto = self._tmpl_prefix + "%(title)s-%(id)s.%(ext)s"
+        # Hidden alongside the downloads so the cache travels with them;
+        # list_downloads only surfaces plain files, so the dir stays invisible
+        self._meta_cache_dir = self.output_dir / ".meta_cache"
+        # url -> (monotonic timestamp, full extractor info dict); lets the
+        # common "show info, then download" flow pay for extraction once
+        self._info_cache = {}
+        # Progress is only worth printing on an interactive terminal, and
+        # even there a few redraws per second is plenty
+        self._is_tty = sys.stdout.isatty()
+        self._last_print = 0.0
+        # Pool of YoutubeDL instances keyed by option signature, so repeat
+        # calls reuse the warm extractor tables and HTTP connection pool
+        # instead of paying the setup (and a TLS handshake) every time.
+        # Ordered oldest-key-first for LRU eviction at YDL_POOL_MAX
+        self._ydl_pool = OrderedDict()
+        self._ydl_pool_lock = threading.Lock()
+        atexit.register(self._close_ydl_pool)
 
     def _progress_hook(self, d):
-        """Callback for download progress"""
+        """Callback for download progress (interactive terminals only)"""
+        if not self._is_tty:
+            # yt-dlp fires this for every downloaded chunk; when stdout is a
+            # pipe or log file the formatted prints are pure write-syscall
+            # overhead with nobody watching the carriage returns
+            return
         if d.get("status") == "downloading":
+            now = time.monotonic()
+            if now - self._last_print < 0.25:
+                return
+            self._last_print = now
             pct = d.get("_percent_str", "").strip()
             spd = d.get("_speed_str", "")
             eta = d.get("_eta_str", "")
@@ -31,6 +192,241 @@ class YouTubeDownloader:
         elif d.get("status") == "finished":
             print(f"\nDownload complete: {d.get('filename')}")
 
+    @contextmanager
+    def _borrow_ydl(self, opts):
+        """
+        Check a YoutubeDL instance out of the pool for exclusive use
+
+        YoutubeDL is not safe for concurrent downloads on one instance, so
+        the pool hands each borrower its own: a free instance with the same
+        option signature is reused (keeping its persistent connections and
+        extractor state warm), otherwise a new one is built and joins the
+        pool when returned. Option values are keyed by repr, so callables
+        should be stable objects (bound methods, module functions) — a fresh
+        lambda per call would defeat the reuse.
+
+        Signatures vary with caller input (outtmpl embeds custom filenames,
+        batch runs carry per-batch hooks), so idle instances are capped at
+        YDL_POOL_MAX with least-recently-used keys evicted and closed —
+        otherwise a long-lived server would retain one instance per distinct
+        signature forever.
+        """
+        import yt_dlp  # deferred: free after the first call via sys.modules
+
+        key = tuple(sorted((k, repr(v)) for k, v in opts.items()))
+        with self._ydl_pool_lock:
+            free = self._ydl_pool.get(key)
+            ydl = free.pop() if free else None
+            if free is not None and not free:
+                # Drop emptied keys so LRU eviction never sees a hollow entry
+                del self._ydl_pool[key]
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(opts)
+        try:
+            yield ydl
+        finally:
+            evicted = []
+            with self._ydl_pool_lock:
+                self._ydl_pool.setdefault(key, []).append(ydl)
+                self._ydl_pool.move_to_end(key)
+                total = sum(len(v) for v in self._ydl_pool.values())
+                while total > YDL_POOL_MAX:
+                    old_key, instances = next(iter(self._ydl_pool.items()))
+                    evicted.append(instances.pop(0))
+                    if not instances:
+                        del self._ydl_pool[old_key]
+                    total -= 1
+            # Close outside the lock; teardown can do real work
+            for old in evicted:
+                try:
+                    old.close()
+                except Exception:
+                    pass
+
+    def _close_ydl_pool(self):
+        """Close every pooled YoutubeDL instance (registered with atexit)"""
+        with self._ydl_pool_lock:
+            for instances in self._ydl_pool.values():
+                for ydl in instances:
+                    try:
+                        ydl.close()
+                    except Exception:
+                        pass
+            self._ydl_pool.clear()
+
+    def _meta_cache_path(self, url):
+        """Cache file for a URL's metadata (filename-safe hash key)"""
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self._meta_cache_dir / f"{key}.json"
+
+    def _meta_cache_get(self, url):
+        """Return cached metadata for a URL, or None if missing/expired"""
+        try:
+            with open(self._meta_cache_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry.get("cached_at", 0) > META_CACHE_TTL:
+                return None
+            return entry.get("info")
+        except (OSError, ValueError):
+            return None
+
+    def _meta_cache_put(self, url, info):
+        """Persist metadata for a URL so later lookups skip the extractor"""
+        try:
+            self._meta_cache_dir.mkdir(exist_ok=True)
+            entry = {"url": url, "cached_at": time.time(), "info": info}
+            with open(self._meta_cache_path(url), "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except OSError:
+            # Cache is best-effort; a failed write never blocks the lookup
+            pass
+
+    def invalidate_metadata(self, url):
+        """Drop the cached metadata for a single URL"""
+        try:
+            self._meta_cache_path(url).unlink()
+        except OSError:
+            pass
+
+    def clear_metadata_cache(self):
+        """Drop all cached metadata"""
+        if self._meta_cache_dir.exists():
+            for path in self._meta_cache_dir.glob("*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _cached_info(self, url):
+        """Return a fresh full info dict for a URL, or None"""
+        entry = self._info_cache.get(url)
+        if entry is None:
+            return None
+        cached_at, info = entry
+        if time.monotonic() - cached_at > INFO_CACHE_TTL:
+            del self._info_cache[url]
+            return None
+        return info
+
+    @staticmethod
+    def _hash_file(path):
+        """sha256 of a file, streamed in 1 MiB chunks"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _sidecar_meta(self, filepath, info):
+        """
+        Read or create the <file>.meta.json sidecar for a downloaded file
+
+        The sidecar records the content sha256 plus the display metadata, so
+        downstream stages (pose analysis on the returned filepath) can key
+        work by content instead of filename and recognize identical bytes
+        across quality-variant re-downloads — without re-hashing the file.
+        """
+        sidecar = f"{filepath}.meta.json"
+        try:
+            with open(sidecar, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("sha256"):
+                return meta
+        except (OSError, ValueError):
+            pass
+        meta = {
+            "sha256": self._hash_file(filepath),
+            "title": info.get("title", "Unknown"),
+            "duration": info.get("duration", 0),
+            "thumbnail": info.get("thumbnail", ""),
+        }
+        try:
+            with open(sidecar, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except OSError:
+            # Sidecar is best-effort; the download result stands without it
+            pass
+        return meta
+
+    def find_by_hash(self, sha256):
+        """
+        Locate an already-downloaded file by content hash
+
+        Scans the sidecars in the output directory and returns the matching
+        video's filepath, or None. Lets a pipeline that already processed
+        these bytes under another name reuse its results.
+        """
+        for sidecar in self.output_dir.glob("*.meta.json"):
+            try:
+                with open(sidecar, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get("sha256") == sha256:
+                filepath = Path(str(sidecar)[:-len(".meta.json")])
+                if filepath.exists():
+                    return str(filepath)
+        return None
+
+    @staticmethod
+    def _preflight_error(url):
+        """
+        Cheap URL sanity check run before any extractor machinery
+
+        Returns an error message for input that could never download, or
+        None to proceed. Only structure is validated — no network probe —
+        so typos fail in microseconds instead of after a full extractor
+        run, while every yt-dlp-supported platform still gets through.
+        """
+        parts = urlparse(url)
+        if not parts.scheme:
+            # yt-dlp's _VALID_URL patterns make the scheme optional
+            # ("youtu.be/ID" downloads fine), so normalize the same way
+            # instead of rejecting input that used to work
+            parts = urlparse("https://" + url)
+        if parts.scheme not in ("http", "https"):
+            return "Not a valid video URL"
+        # Only screen out clearly non-URL text: no host at all, or
+        # whitespace where a host should be. IP literals, localhost:8000,
+        # single-label intranet hosts, and IDN hostnames are all valid input
+        # for yt-dlp's generic extractor and must keep reaching it
+        if not parts.netloc or any(c.isspace() for c in parts.netloc):
+            return "Not a valid video URL"
+        host = parts.netloc.lower()
+        if host.startswith("www.") or host.startswith("m."):
+            host = host.split(".", 1)[1]
+        if host in ("youtube.com", "youtu.be") and not _YT_ID.search(url):
+            return "Not a valid YouTube video URL (no video ID found)"
+        return None
+
+    @staticmethod
+    def _ensure_mp4(ydl, info, filepath):
+        """
+        Remux the downloaded file to mp4 only when it is not one already
+
+        With the mp4-first format specs this is a rare fallback. A stream
+        copy (-c copy) rewrites just the container — no re-encode, one pass
+        over the bytes; only if the codecs refuse the mp4 container does
+        ffmpeg fall back to a real conversion.
+        """
+        rd = info.get("requested_downloads") or []
+        actual = rd[0].get("filepath") if rd else None
+        if not actual:
+            actual = ydl.prepare_filename(info)
+        if actual.endswith(".mp4") or not os.path.exists(actual):
+            return
+        remux = subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error",
+             "-i", actual, "-c", "copy", filepath],
+        )
+        if remux.returncode != 0:
+            subprocess.run(
+                ["ffmpeg", "-y", "-loglevel", "error",
+                 "-i", actual, filepath],
+                check=True,
+            )
+        os.remove(actual)
+
     def download_video(
         self,
         url,
@@ -38,7 +434,10 @@ class YouTubeDownloader:
         audio_only=False,
         quality="best",
         cookies_file=None,
-        progress_callback=None
+        progress_callback=None,
+        info=None,
+        frag_jobs=None,
+        quiet=False
     ):
         """
         Download a video from YouTube, YouTube Shorts, TikTok, or 1000+ platforms
@@ -50,31 +449,53 @@ class YouTubeDownloader:
             quality: Video quality ('best', '1080p', '720p', '480p')
             cookies_file: Path to cookies.txt for age-restricted videos
             progress_callback: Optional callback function for progress updates
+            info: Optional pre-extracted info dict (skips re-extraction); a
+                  recent get_video_info call on the same URL is used the same
+                  way automatically
+            frag_jobs: Parallel fragment fetches for HLS/DASH formats
+                       (default: LIVEDANCE_FRAG_JOBS env var, or 4)
+            quiet: Suppress yt-dlp's own console output (batch mode)
 
         Returns:
             dict with 'success', 'filepath', 'title', 'duration' keys
         """
+        preflight = self._preflight_error(url)
+        if preflight:
+            return {"success": False, "error": preflight, "filepath": None}
+
         try:
-            # Determine output template
+            # Determine output template; concatenation, not str.format —
+            # the caller-supplied filename may legally contain braces
             if output_filename:
-                outtmpl = str(self.output_dir / f"{output_filename}.%(ext)s")
+                outtmpl = self._tmpl_prefix + output_filename + ".%(ext)s"
             else:
-                outtmpl = str(self.output_dir / "%(title)s-%(id)s.%(ext)s")
+                outtmpl = self._tmpl_auto
 
             # Base options with enhanced compatibility
             ydl_opts = {
                 "outtmpl": outtmpl,
                 "progress_hooks": [progress_callback or self._progress_hook],
                 "noplaylist": True,
-                "quiet": False,
-                "no_warnings": False,
+                "quiet": quiet,
+                "no_warnings": quiet,
                 "nocheckcertificate": True,  # Fix for SSL certificate issues on macOS
                 # Enhanced options for better platform support
                 "ignoreerrors": False,
                 "geo_bypass": True,  # Bypass geographic restrictions
                 "age_limit": None,  # No age limit restriction
+                # Fetch HLS/DASH fragments in parallel instead of chaining
+                # one RTT per fragment
+                "concurrent_fragment_downloads": frag_jobs or FRAG_JOBS,
             }
 
+            if USE_ARIA2C and shutil.which("aria2c"):
+                # 16-way ranged GETs per file; sidesteps per-connection
+                # throttling when one TCP stream can't fill the link
+                ydl_opts["external_downloader"] = "aria2c"
+                ydl_opts["external_downloader_args"] = {
+                    "aria2c": ["-x", "16", "-s", "16", "-k", "1M"]
+                }
+
             if audio_only:
                 # Audio-only download
                 ydl_opts["format"] = "bestaudio/best"
@@ -84,46 +505,76 @@ class YouTubeDownloader:
                     "preferredquality": "0",  # best quality
                 }]
             else:
-                # Video download
+                # Video download. Prefer streams that are already mp4/m4a so
+                # the merged output needs no conversion; the generic specs
+                # remain as fallbacks for platforms without mp4 variants
                 format_map = {
-                    "best": "bv*+ba/b",
-                    "1080p": "bestvideo[height<=1080]+bestaudio/best",
-                    "720p": "bestvideo[height<=720]+bestaudio/best",
-                    "480p": "bestvideo[height<=480]+bestaudio/best",
+                    "best": "bv*[ext=mp4]+ba[ext=m4a]/b[ext=mp4]/bv*+ba/b",
+                    "1080p": "bestvideo[ext=mp4][height<=1080]+bestaudio[ext=m4a]/"
+                             "bestvideo[height<=1080]+bestaudio/best",
+                    "720p": "bestvideo[ext=mp4][height<=720]+bestaudio[ext=m4a]/"
+                            "bestvideo[height<=720]+bestaudio/best",
+                    "480p": "bestvideo[ext=mp4][height<=480]+bestaudio[ext=m4a]/"
+                            "bestvideo[height<=480]+bestaudio/best",
                 }
-                ydl_opts["format"] = format_map.get(quality, "bv*+ba/b")
+                ydl_opts["format"] = format_map.get(quality, format_map["best"])
                 ydl_opts["merge_output_format"] = "mp4"
-                ydl_opts["postprocessors"] = [
-                    {"key": "FFmpegVideoConvertor", "preferedformat": "mp4"}
-                ]
 
             if cookies_file:
                 ydl_opts["cookiefile"] = cookies_file
 
-            # Download the video
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-
-                # Get the final filename
-                if audio_only:
-                    # For audio, extension changes to m4a
-                    if output_filename:
-                        filepath = self.output_dir / f"{output_filename}.m4a"
-                    else:
-                        filepath = self.output_dir / f"{info['title']}-{info['id']}.m4a"
-                else:
-                    # For video, extension is mp4
-                    if output_filename:
-                        filepath = self.output_dir / f"{output_filename}.mp4"
-                    else:
-                        filepath = self.output_dir / f"{info['title']}-{info['id']}.mp4"
+            # Download the video, reusing a pre-extracted info dict when one
+            # is available (the "show info, then download" flow would
+            # otherwise scrape the watch page twice)
+            final_ext = ".m4a" if audio_only else ".mp4"
+            cached = info if info is not None else self._cached_info(url)
+            with self._borrow_ydl(ydl_opts) as ydl:
+                if cached is None:
+                    # Extract once without downloading so the target path is
+                    # known up front; the same dict then drives the download
+                    # below without a second scrape
+                    cached = ydl.extract_info(url, download=False)
+
+                # prepare_filename applies yt-dlp's own outtmpl rendering
+                # (including its filesystem sanitization), so this matches
+                # the file actually written — unlike pasting title+id, which
+                # diverged on titles containing '/' and the like
+                filepath = os.path.splitext(ydl.prepare_filename(cached))[0] + final_ext
+                if os.path.isfile(filepath) and os.path.getsize(filepath) > 0:
+                    # Idempotent re-run: the target is already on disk
+                    return {
+                        "success": True,
+                        "filepath": filepath,
+                        "title": cached.get("title", "Unknown"),
+                        "duration": cached.get("duration", 0),
+                        "thumbnail": cached.get("thumbnail", ""),
+                        "sha256": self._sidecar_meta(filepath, cached)["sha256"],
+                        "skipped": True,
+                    }
 
+                try:
+                    # process_ie_result is the --load-info-json entry point:
+                    # it runs format selection + download against the given
+                    # info without re-extracting. Copy first; it mutates its
+                    # argument
+                    info = ydl.process_ie_result(dict(cached), download=True)
+                except Exception:
+                    info = ydl.extract_info(url, download=True)
+
+                filepath = os.path.splitext(ydl.prepare_filename(info))[0] + final_ext
+                if not audio_only:
+                    self._ensure_mp4(ydl, info, filepath)
+                sha256 = (
+                    self._sidecar_meta(filepath, info)["sha256"]
+                    if os.path.exists(filepath) else None
+                )
                 return {
                     "success": True,
-                    "filepath": str(filepath),
+                    "filepath": filepath,
                     "title": info.get("title", "Unknown"),
                     "duration": info.get("duration", 0),
                     "thumbnail": info.get("thumbnail", ""),
+                    "sha256": sha256,
                 }
 
         except Exception as e:
@@ -146,16 +597,99 @@ class YouTubeDownloader:
                 "filepath": None,
             }
 
-    def get_video_info(self, url):
+    def download_batch(self, urls, max_workers=4, **kwargs):
+        """
+        Download several URLs concurrently
+
+        yt-dlp downloads are network-bound and the merge step runs ffmpeg as
+        a subprocess, so a handful of threads keeps the link saturated
+        instead of serializing each download behind the previous one's RTTs.
+        On an interactive terminal the workers stream progress through a
+        queue to one printer thread, which repaints a one-line-per-video
+        status block; off-TTY the hooks are silenced and one summary line
+        is printed per completed URL.
+
+        Args:
+            urls: Iterable of video URLs
+            max_workers: Number of concurrent downloads (default: 4)
+            **kwargs: Forwarded to download_video (quality, audio_only, ...)
+
+        Returns:
+            List of result dicts, one per URL, in input order
+        """
+        urls = list(urls)
+        status_q = None
+        printer = None
+        if len(urls) > 1:
+            # yt-dlp's own per-chunk logging from N workers is both
+            # unreadable and a real CPU sink at high download rates
+            kwargs.setdefault("quiet", True)
+            if "progress_callback" not in kwargs:
+                if self._is_tty:
+                    status_q = queue.Queue()
+                    kwargs["progress_callback"] = _QueueProgress(status_q.put)
+                    printer = threading.Thread(
+                        target=_batch_status_printer,
+                        args=(status_q,),
+                        daemon=True,
+                    )
+                    printer.start()
+                else:
+                    kwargs["progress_callback"] = _noop_progress_hook
+
+        def _one(url):
+            result = self.download_video(url, **kwargs)
+            if result["success"]:
+                line = f"Done: {url} -> {result['filepath']}"
+                key = _status_key(result["filepath"])
+            else:
+                line = f"Failed: {url}: {result['error']}"
+                key = url
+            if status_q is not None:
+                status_q.put((key, line))
+            else:
+                print(line)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_one, urls))
+
+        if status_q is not None:
+            status_q.put(None)
+            printer.join()
+        return results
+
+    def get_video_info(self, url, refresh=False, fast=True):
         """
         Get video information without downloading
 
+        Results are cached on disk for META_CACHE_TTL seconds, so repeated
+        lookups (UI previews, retries at different qualities) cost one small
+        JSON read instead of a full extractor run.
+
         Args:
             url: Video URL (YouTube, YouTube Shorts, TikTok, Instagram, etc.)
+            refresh: If True, bypass the metadata cache and re-extract
+            fast: If True, skip scraping manifests/comments the preview
+                  never shows (noticeably faster on YouTube URLs). Use
+                  fast=False to pre-warm a following download_video call
+                  with the full format list
 
         Returns:
             dict with video metadata
         """
+        preflight = self._preflight_error(url)
+        if preflight:
+            return {"success": False, "error": preflight}
+
+        # fast=False exists to pre-warm a following download_video with the
+        # full format list, so it must reach the extractor even when the
+        # trimmed metadata is already cached on disk
+        if not refresh and fast:
+            cached = self._meta_cache_get(url)
+            if cached is not None:
+                return dict(cached)
+
         try:
             ydl_opts = {
                 "quiet": True,
@@ -163,9 +697,21 @@ class YouTubeDownloader:
                 "nocheckcertificate": True,  # Fix for SSL certificate issues on macOS
                 "geo_bypass": True,  # Bypass geographic restrictions
             }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if fast:
+                # Metadata-only lookup: don't pull the HLS/DASH manifests,
+                # translated subtitles, or comments that the preview never
+                # displays. Non-YouTube extractors ignore these args
+                ydl_opts["extractor_args"] = {
+                    "youtube": {"skip": ["hls", "dash", "translated_subs"]}
+                }
+                ydl_opts["getcomments"] = False
+            with self._borrow_ydl(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
-                return {
+                if not fast:
+                    # A fast extraction is missing formats, so it cannot
+                    # drive a later download — only full infos are shared
+                    self._info_cache[url] = (time.monotonic(), info)
+                result = {
                     "success": True,
                     "title": info.get("title", ""),
                     "duration": info.get("duration", 0),
@@ -175,6 +721,8 @@ class YouTubeDownloader:
                     "description": info.get("description", ""),
                     "platform": info.get("extractor_key", "Unknown"),
                 }
+                self._meta_cache_put(url, result)
+                return result
         except Exception as e:
             error_msg = str(e)
 
@@ -194,6 +742,28 @@ class YouTubeDownloader:
                 "error": error_msg,
             }
 
+    def get_video_info_many(self, urls, max_workers=8):
+        """
+        Fetch metadata for several URLs concurrently
+
+        Each lookup is a blocking network round-trip, so fanning them out
+        over a thread pool collapses N round-trips into roughly one; URLs
+        already in the metadata cache return without touching the network.
+
+        Args:
+            urls: Iterable of video URLs
+            max_workers: Concurrent lookups (default: 8)
+
+        Returns:
+            List of get_video_info result dicts, one per URL, in input order
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        workers = min(max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.get_video_info, urls))
+
 
 # Standalone CLI usage
 if __name__ == "__main__":
@@ -202,7 +772,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Download YouTube videos for dance pose analysis"
     )
-    parser.add_argument("url", help="YouTube video URL")
+    parser.add_argument("url", nargs="?", help="YouTube video URL")
     parser.add_argument(
         "-o", "--output",
         help="Output filename (without extension)"
@@ -227,19 +797,70 @@ if __name__ == "__main__":
         default="downloads",
         help="Download directory (default: downloads)"
     )
+    parser.add_argument(
+        "-a", "--batch-file",
+        help="File with one video URL per line ('#' starts a comment)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=4,
+        help="Concurrent downloads in batch mode (default: 4)"
+    )
+    parser.add_argument(
+        "--frag-jobs",
+        type=int,
+        help="Parallel fragment fetches for HLS/DASH formats "
+             "(default: LIVEDANCE_FRAG_JOBS env var, or 4)"
+    )
     parser.add_argument(
         "--info",
         action="store_true",
         help="Get video info without downloading"
     )
+    parser.add_argument(
+        "--full-info",
+        action="store_true",
+        help="With --info: run a full extraction instead of the fast "
+             "metadata-only one"
+    )
+    parser.add_argument(
+        "--refresh-metadata",
+        action="store_true",
+        help="Ignore the on-disk metadata cache and re-fetch video info"
+    )
 
     args = parser.parse_args()
 
+    if not args.url and not args.batch_file:
+        parser.error("a URL or -a/--batch-file is required")
+
     downloader = YouTubeDownloader(output_dir=args.directory)
 
-    if args.info:
+    if args.batch_file:
+        with open(args.batch_file) as f:
+            urls = [
+                line.strip() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+        print(f"Downloading {len(urls)} videos ({args.jobs} at a time)...")
+        results = downloader.download_batch(
+            urls,
+            max_workers=args.jobs,
+            audio_only=args.audio,
+            quality=args.quality,
+            cookies_file=args.cookies,
+            frag_jobs=args.frag_jobs,
+        )
+        succeeded = sum(1 for r in results if r["success"])
+        print(f"\n{succeeded}/{len(results)} downloads succeeded")
+    elif args.info:
         print("Fetching video information...")
-        info = downloader.get_video_info(args.url)
+        info = downloader.get_video_info(
+            args.url,
+            refresh=args.refresh_metadata,
+            fast=not args.full_info,
+        )
         if info["success"]:
             print(f"\nTitle: {info['title']}")
             print(f"Duration: {info['duration']}s")
@@ -255,6 +876,7 @@ if __name__ == "__main__":
             audio_only=args.audio,
             quality=args.quality,
             cookies_file=args.cookies,
+            frag_jobs=args.frag_jobs,
         )
 
         if result["success"]:
@@ -31,8 +31,6 @@ from pathlib import Path
 backend_path = Path(__file__).parent / "backend"
 sys.path.insert(0, str(backend_path))
 
-from youtube_downloader import YouTubeDownloader
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -56,6 +54,7 @@ Examples:
 
     parser.add_argument(
         "url",
+        nargs="?",
         help="YouTube video URL"
     )
     parser.add_argument(
@@ -82,21 +81,80 @@ Examples:
         default="backend/downloads",
         help="Download directory (default: backend/downloads)"
     )
+    parser.add_argument(
+        "-a", "--batch-file",
+        help="File with one video URL per line ('#' starts a comment)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=4,
+        help="Concurrent downloads in batch mode (default: 4)"
+    )
+    parser.add_argument(
+        "--frag-jobs",
+        type=int,
+        help="Parallel fragment fetches for HLS/DASH formats "
+             "(default: LIVEDANCE_FRAG_JOBS env var, or 4)"
+    )
     parser.add_argument(
         "--info",
         action="store_true",
         help="Get video information without downloading"
     )
+    parser.add_argument(
+        "--full-info",
+        action="store_true",
+        help="With --info: run a full extraction instead of the fast "
+             "metadata-only one"
+    )
+    parser.add_argument(
+        "--refresh-metadata",
+        action="store_true",
+        help="Ignore the on-disk metadata cache and re-fetch video info"
+    )
 
     args = parser.parse_args()
 
+    if not args.url and not args.batch_file:
+        parser.error("a URL or -a/--batch-file is required")
+
+    # Imported after argument parsing so --help and usage errors don't pay
+    # the module's import cost
+    from youtube_downloader import YouTubeDownloader
+
     # Initialize downloader
     downloader = YouTubeDownloader(output_dir=args.directory)
 
-    if args.info:
+    if args.batch_file:
+        # Batch download: one URL per line, '#' comments allowed
+        with open(args.batch_file) as f:
+            urls = [
+                line.strip() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+        print(f"Downloading {len(urls)} videos ({args.jobs} at a time)...")
+        results = downloader.download_batch(
+            urls,
+            max_workers=args.jobs,
+            audio_only=args.audio,
+            quality=args.quality,
+            cookies_file=args.cookies,
+            frag_jobs=args.frag_jobs,
+        )
+        succeeded = sum(1 for r in results if r["success"])
+        print(f"\n{succeeded}/{len(results)} downloads succeeded")
+        if succeeded < len(results):
+            sys.exit(1)
+
+    elif args.info:
         # Get video info only
         print("Fetching video information...")
-        info = downloader.get_video_info(args.url)
+        info = downloader.get_video_info(
+            args.url,
+            refresh=args.refresh_metadata,
+            fast=not args.full_info,
+        )
 
         if info["success"]:
             print("\n" + "="*60)
@@ -123,6 +181,7 @@ Examples:
             audio_only=args.audio,
             quality=args.quality,
             cookies_file=args.cookies,
+            frag_jobs=args.frag_jobs,
         )
 
         if result["success"]:
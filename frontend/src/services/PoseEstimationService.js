@@ -177,23 +177,27 @@ class PoseEstimationService {
       this.canvas.height = videoElement.videoHeight;
       this.ctx.drawImage(videoElement, 0, 0);
       
-      // Convert to base64 JPEG
-      const imageData = this.canvas.toDataURL('image/jpeg', 0.8);
-      const base64Data = imageData.split(',')[1]; // Remove data:image/jpeg;base64, prefix
-      
+      // Encode as binary JPEG - Socket.IO sends ArrayBuffers as raw binary
+      // frames, so we skip base64 entirely (~33% less wire traffic and no
+      // encode/decode pass on either side)
+      const blob = await new Promise((resolve) =>
+        this.canvas.toBlob(resolve, 'image/jpeg', 0.8)
+      );
+      const imageBuffer = await blob.arrayBuffer();
+
       const captureTime = performance.now() - captureStart;
-      
+
       const currentSequence = this.sequenceNumber++;
-      
+
       // Store send time and capture time for THIS sequence
       this.frameSendTimes.set(currentSequence, {
         sendTime: sendTime,
         captureTime: captureTime
       });
-      
+
       // Send frame via WebSocket with mode flag
       this.socket.emit('frame', {
-        image: base64Data,
+        image: imageBuffer,
         timestamp: Date.now(),
         sequence: currentSequence,
         use3D: this.use3D